@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/__main__.py
+"""
+단일 CLI 진입점
+
+python -m AI_study_automation <command> [인자...]
+
+- 고른 명령의 모듈만 import (다른 스크립트, requests, .env는 건드리지 않음)
+- 스크립트 설정(ENV)은 각 모듈의 configure()가 실제로 일할 때만 읽음
+  → --help나 할 일 없는 실행(예: study/ 변경 없는 git_to_notion)은 설정 없이 바로 끝남
+- 나머지 인자는 그대로 해당 모듈의 main()으로 전달
+
+실행 예)
+python -m AI_study_automation git_to_notion --event push --paths "study/홍길동/2025-10-18/a.py"
+git diff -z --name-only HEAD~1 -- study/ | python -m AI_study_automation git_to_notion --event push --paths-file -
+python -m AI_study_automation daily_attendance --from 2025-10-01 --to 2025-10-07
+python -m AI_study_automation daemon --list
+python -m AI_study_automation git_to_notion --help
+"""
+
+import importlib
+import sys
+
+# 명령 → (모듈, 설명)
+COMMANDS = {
+    "git_to_notion":    ("scripts.git_to_notion",    "study/ 제출 → Notion 제출 로그 + 오늘 롤업"),
+    "daily_attendance": ("scripts.daily_attendance", "출석 집계 (오늘 또는 --from/--to 범위)"),
+    "notion_watch":     ("scripts.notion_watch",     "Notion 문제 DB 변경 → Discord 카드"),
+    "weekly_reminder":  ("scripts.weekly_reminder",  "주간 출제 리마인드"),
+    "daemon":           ("daemon",                   "상주 스케줄러 (watch/attendance/reminder)"),
+    "receiver":         ("receiver",                 "GitHub 웹훅 수신기"),
+    "bench":            ("bench.run",                "가짜 서버로 오프라인 벤치마크"),
+}
+
+PKG = __package__ or "AI_study_automation"
+
+
+def usage() -> str:
+    lines = [f"usage: python -m {PKG} <command> [args...]", "", "commands:"]
+    lines += [f"  {name:<18} {desc}" for name, (_, desc) in COMMANDS.items()]
+    lines += ["", f"명령별 옵션: python -m {PKG} <command> --help"]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print(usage())
+        return 0 if argv else 2
+
+    name = argv[0].replace("-", "_")
+    if name not in COMMANDS:
+        print(f"unknown command: {argv[0]}\n\n{usage()}", file=sys.stderr)
+        return 2
+
+    module = importlib.import_module(f"{PKG}.{COMMANDS[name][0]}")
+    sys.argv = [f"{PKG} {name}", *argv[1:]]
+    return module.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/bench/fake_server.py
+"""
+오프라인 벤치마크용 가짜 Notion API + Discord 웹훅 서버 (표준 라이브러리만 사용)
+
+Notion (스크립트가 쓰는 범위만)
+- GET   /v1/databases/{id}         속성 목록(이름 → id/type, 페이지에 한 번이라도 쓰인 속성)
+- POST  /v1/databases/{id}/query   filter(and/or, property/timestamp), sorts, start_cursor/page_size,
+                                   ?filter_properties=<id>(반복) 속성 선택
+- POST  /v1/pages                  페이지 생성
+- PATCH /v1/pages/{id}             속성 수정
+Discord
+- POST  /api/webhooks/{id}/{token}[?wait=true]
+- PATCH /api/webhooks/{id}/{token}/messages/{message_id}
+
+옵션
+- latency      : 요청마다 지연(초)
+- error_rate   : 이 확률로 429(Retry-After) 응답을 섞음
+- discord_bucket: (횟수, 초) 웹훅 버킷 한도. 초과 시 429 + X-RateLimit-* 헤더
+
+사용 예)
+    srv = FakeServer(latency=0.02).start()
+    os.environ["NOTION_API_BASE"] = srv.notion_base
+    webhook = srv.webhook_url("alerts")
+"""
+
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _parse_dt(v):
+    """Notion 날짜 문자열 → aware datetime (날짜만 있으면 UTC 자정)"""
+    if not v:
+        return None
+    if len(v) == 10:
+        return datetime.fromisoformat(v).replace(tzinfo=timezone.utc)
+    dt = datetime.fromisoformat(v.replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+# ─────────────────────────────────────────────────────
+# Notion 저장소
+# ─────────────────────────────────────────────────────
+def _read_value(ptype, value):
+    """쓰기 형식({"rich_text":[{"text":{"content":..}}]}) → 읽기 형식(plain_text 포함)"""
+    if ptype in ("title", "rich_text"):
+        return [
+            {"type": "text", "text": {"content": b["text"]["content"]}, "plain_text": b["text"]["content"]}
+            for b in value or []
+        ]
+    return value
+
+
+def _plain(prop) -> str:
+    if not prop:
+        return ""
+    t = prop.get("type")
+    if t in ("title", "rich_text"):
+        return "".join(b.get("plain_text", "") for b in prop.get(t) or [])
+    return ""
+
+
+class NotionStore:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.dbs = {}        # db_id → {page_id: page}
+        self.prop_ids = {}   # db_id → {name: id}
+        self.prop_types = {} # db_id → {name: type}
+
+    def _prop_id(self, db_id, name):
+        ids = self.prop_ids.setdefault(db_id, {})
+        if name not in ids:
+            ids[name] = f"p{len(ids):03d}"
+        return ids[name]
+
+    def _set_props(self, db_id, page, props):
+        for name, val in props.items():
+            (ptype, raw), = val.items()
+            self.prop_types.setdefault(db_id, {})[name] = ptype
+            page["properties"][name] = {"id": self._prop_id(db_id, name), "type": ptype, ptype: _read_value(ptype, raw)}
+
+    def database(self, db_id):
+        with self.lock:
+            types = dict(self.prop_types.get(db_id, {}))
+            return {
+                "object": "database", "id": db_id,
+                "properties": {name: {"id": self.prop_ids[db_id][name], "name": name, "type": t} for name, t in types.items()},
+            }
+
+    def create(self, db_id, props, edited=None):
+        with self.lock:
+            now = edited or _now_iso()
+            page = {
+                "object": "page",
+                "id": str(uuid.uuid4()),
+                "created_time": now,
+                "last_edited_time": now,
+                "archived": False,
+                "parent": {"type": "database_id", "database_id": db_id},
+                "properties": {},
+            }
+            self._set_props(db_id, page, props)
+            self.dbs.setdefault(db_id, {})[page["id"]] = page
+            return page
+
+    def update(self, page_id, props):
+        with self.lock:
+            for db_id, pages in self.dbs.items():
+                if page_id in pages:
+                    page = pages[page_id]
+                    self._set_props(db_id, page, props)
+                    page["last_edited_time"] = _now_iso()
+                    return page
+        return None
+
+    def pages(self, db_id):
+        with self.lock:
+            return list(self.dbs.get(db_id, {}).values())
+
+    # ── filter / sort ────────────────────────────────
+    def _match_cond(self, value, cond, kind):
+        for op, arg in cond.items():
+            if kind == "text":
+                v = value or ""
+                ok = {
+                    "equals": lambda: v == arg, "does_not_equal": lambda: v != arg,
+                    "contains": lambda: arg in v, "does_not_contain": lambda: arg not in v,
+                    "starts_with": lambda: v.startswith(arg), "ends_with": lambda: v.endswith(arg),
+                    "is_empty": lambda: not v, "is_not_empty": lambda: bool(v),
+                }[op]()
+            elif kind == "date":
+                if op == "is_empty":
+                    ok = not value
+                elif op == "is_not_empty":
+                    ok = bool(value)
+                elif not value:
+                    ok = False
+                elif op == "equals":
+                    ok = value[:10] == arg[:10] if len(arg) == 10 or len(value) == 10 else _parse_dt(value) == _parse_dt(arg)
+                else:
+                    a, b = _parse_dt(value), _parse_dt(arg)
+                    ok = {"before": a < b, "after": a > b, "on_or_before": a <= b, "on_or_after": a >= b}[op]
+            else:   # select / checkbox / number
+                ok = {"equals": value == arg, "does_not_equal": value != arg,
+                      "is_empty": value is None, "is_not_empty": value is not None}[op]
+            if not ok:
+                return False
+        return True
+
+    def match(self, page, flt) -> bool:
+        if not flt:
+            return True
+        if "and" in flt:
+            return all(self.match(page, f) for f in flt["and"])
+        if "or" in flt:
+            return any(self.match(page, f) for f in flt["or"])
+        if "timestamp" in flt:
+            ts = flt["timestamp"]
+            return self._match_cond(page.get(ts), flt[ts], "date")
+        prop = page["properties"].get(flt["property"])
+        for kind in ("rich_text", "title", "date", "select", "checkbox", "number", "url"):
+            if kind not in flt:
+                continue
+            if kind in ("rich_text", "title"):
+                return self._match_cond(_plain(prop), flt[kind], "text")
+            if kind == "date":
+                return self._match_cond(((prop or {}).get("date") or {}).get("start"), flt[kind], "date")
+            if kind == "select":
+                return self._match_cond(((prop or {}).get("select") or {}).get("name"), flt[kind], "eq")
+            return self._match_cond((prop or {}).get(kind), flt[kind], "eq")
+        return True
+
+    @staticmethod
+    def _sort_key(page, s):
+        if "timestamp" in s:
+            return page.get(s["timestamp"]) or ""
+        prop = page["properties"].get(s["property"]) or {}
+        t = prop.get("type")
+        if t == "date":
+            return (prop.get("date") or {}).get("start") or ""
+        if t == "select":
+            return (prop.get("select") or {}).get("name") or ""
+        if t in ("title", "rich_text"):
+            return _plain(prop)
+        v = prop.get(t)
+        return "" if v is None else str(v)
+
+    def query(self, db_id, body, filter_properties=None):
+        rows = [p for p in self.pages(db_id) if self.match(p, body.get("filter"))]
+        for s in reversed(body.get("sorts") or []):
+            rows.sort(key=lambda p: self._sort_key(p, s), reverse=s.get("direction") == "descending")
+        start = int(body.get("start_cursor") or 0)
+        size = min(int(body.get("page_size") or 100), 100)
+        chunk = rows[start:start + size]
+        if filter_properties:
+            keep = set(filter_properties)
+            chunk = [
+                {**p, "properties": {n: v for n, v in p["properties"].items() if v["id"] in keep or n in keep}}
+                for p in chunk
+            ]
+        more = start + size < len(rows)
+        return {"object": "list", "results": chunk, "has_more": more, "next_cursor": str(start + size) if more else None}
+
+
+# ─────────────────────────────────────────────────────
+# HTTP
+# ─────────────────────────────────────────────────────
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive 재사용 여부를 그대로 측정
+    disable_nagle_algorithm = True  # 헤더/본문 분할 전송 시 delayed-ACK 지연(~40ms) 방지
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=None, headers=None):
+        data = b"" if body is None else json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, str(v))
+        if data:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.fake.record_out(len(data))
+
+    def _handle(self, method):
+        fake = self.server.fake
+        url = urlsplit(self.path)
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        body = json.loads(raw) if raw else {}
+        parts = [p for p in url.path.split("/") if p]
+        service = "notion" if parts[:1] == ["v1"] else "discord"
+        route = fake.route_of(method, parts)
+        fake.record_in(service, route, len(raw) + len(self.path))
+
+        if fake.latency:
+            time.sleep(fake.latency)
+        if fake.error_rate and random.random() < fake.error_rate:
+            fake.count("429", service)
+            return self._send(429, {"message": "rate limited", "retry_after": 0.05}, {"Retry-After": "0.05"})
+
+        if service == "notion":
+            return self._notion(method, parts, body, parse_qs(url.query))
+        return self._discord(method, parts, body, parse_qs(url.query))
+
+    def _notion(self, method, parts, body, qs):
+        store = self.server.fake.notion
+        if method == "POST" and len(parts) == 4 and parts[1] == "databases" and parts[3] == "query":
+            return self._send(200, store.query(parts[2], body, qs.get("filter_properties")))
+        if method == "GET" and len(parts) == 3 and parts[1] == "databases":
+            return self._send(200, store.database(parts[2]))
+        if method == "POST" and parts[1:] == ["pages"]:
+            page = store.create(body["parent"]["database_id"], body.get("properties", {}))
+            return self._send(200, page)
+        if method == "PATCH" and len(parts) == 3 and parts[1] == "pages":
+            page = store.update(parts[2], body.get("properties", {}))
+            if page is None:
+                return self._send(404, {"object": "error", "message": "page not found"})
+            return self._send(200, page)
+        return self._send(404, {"object": "error", "message": f"unsupported {method} {'/'.join(parts)}"})
+
+    def _discord(self, method, parts, body, qs):
+        fake = self.server.fake
+        hook = "/".join(parts[:4])
+        headers = fake.discord_headers(hook)
+        if headers is None:
+            fake.count("429", "discord")
+            return self._send(429, {"message": "You are being rate limited.", "retry_after": fake.discord_bucket[1], "global": False},
+                              {"Retry-After": fake.discord_bucket[1]})
+        if method == "POST" and len(parts) == 4:
+            msg = fake.add_message(hook, body)
+            if (qs.get("wait") or ["false"])[0] == "true":
+                return self._send(200, msg, headers)
+            return self._send(204, None, headers)
+        if method == "PATCH" and len(parts) == 6 and parts[4] == "messages":
+            msg = fake.edit_message(hook, parts[5], body)
+            if msg is None:
+                return self._send(404, {"message": "Unknown Message", "code": 10008})
+            return self._send(200, msg, headers)
+        return self._send(404, {"message": "404: Not Found"})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+
+class FakeServer:
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, discord_bucket=None, host: str = "127.0.0.1"):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.discord_bucket = discord_bucket    # (limit, window_seconds) 또는 None
+        self.notion = NotionStore()
+        self.messages = {}                      # hook → [message]
+        self._lock = threading.Lock()
+        self._windows = {}                      # hook → (window_start, used)
+        self.reset_stats()
+        self.httpd = ThreadingHTTPServer((host, 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+
+    # ── lifecycle ───────────────────────────────────
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def notion_base(self) -> str:
+        return f"{self.base_url}/v1"
+
+    def webhook_url(self, name: str = "bench") -> str:
+        return f"{self.base_url}/api/webhooks/{name}/token"
+
+    # ── stats ───────────────────────────────────────
+    def reset_stats(self):
+        with self._lock:
+            self.stats = Counter()
+
+    @staticmethod
+    def route_of(method, parts):
+        if parts[:1] == ["v1"]:
+            if len(parts) >= 4 and parts[1] == "databases":
+                return f"{method} /v1/databases/:id/{parts[3]}"
+            return f"{method} /v1/{parts[1] if len(parts) > 1 else ''}" + ("/:id" if len(parts) > 2 else "")
+        return f"{method} /webhooks" + ("/messages" if "messages" in parts else "")
+
+    def record_in(self, service, route, nbytes):
+        with self._lock:
+            self.stats[f"{service}.requests"] += 1
+            self.stats[f"route:{route}"] += 1
+            self.stats["bytes_in"] += nbytes
+
+    def record_out(self, nbytes):
+        with self._lock:
+            self.stats["bytes_out"] += nbytes
+
+    def count(self, what, service):
+        with self._lock:
+            self.stats[f"{service}.{what}"] += 1
+
+    # ── discord ─────────────────────────────────────
+    def discord_headers(self, hook):
+        """버킷에 여유가 있으면 X-RateLimit-* 헤더, 없으면 None(→429)"""
+        if not self.discord_bucket:
+            return {}
+        limit, window = self.discord_bucket
+        with self._lock:
+            now = time.monotonic()
+            start, used = self._windows.get(hook, (now, 0))
+            if now - start >= window:
+                start, used = now, 0
+            if used >= limit:
+                return None
+            used += 1
+            self._windows[hook] = (start, used)
+            reset_after = max(0.0, window - (now - start))
+        return {
+            "X-RateLimit-Bucket": hook,
+            "X-RateLimit-Limit": limit,
+            "X-RateLimit-Remaining": limit - used,
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+        }
+
+    def add_message(self, hook, body):
+        with self._lock:
+            msg = {"id": str(len(self.messages.setdefault(hook, [])) + 1), "content": body.get("content", ""),
+                   "embeds": body.get("embeds", [])}
+            self.messages[hook].append(msg)
+            return msg
+
+    def edit_message(self, hook, message_id, body):
+        with self._lock:
+            for msg in self.messages.get(hook, []):
+                if msg["id"] == message_id:
+                    msg.update({k: v for k, v in body.items() if k in ("content", "embeds")})
+                    return msg
+        return None
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/bench/run.py
+"""
+자동화 스크립트 오프라인 벤치마크
+
+가짜 Notion/Discord 서버(fake_server.py)를 띄우고 합성 데이터를 채운 뒤,
+각 스크립트의 main()을 별도 파이썬 프로세스에서 실행해
+벽시계 시간 / HTTP 요청 수(서비스·경로별) / 송수신 바이트 / 429 횟수를 보고
+
+기본은 Actions 워크플로와 같은 설정(NOTION_MIRROR=0)으로 실행. --mirror면 상주 프로세스처럼 로컬 미러 사용
+
+회귀 확인: --check-baseline은 저장된 기준(bench/baseline.json)과 같은 (scenario, size)를 비교해
+HTTP 요청 수(Notion/Discord)가 기준보다 많거나 벽시계 시간이 --max-slowdown배를 넘으면 종료 코드 1
+
+실행 예)
+python -m AI_study_automation.bench.run
+python -m AI_study_automation.bench.run --sizes 10,1000 --scenarios git_to_notion --latency 0.05 --error-rate 0.02
+python -m AI_study_automation.bench.run --json bench.json
+python -m AI_study_automation.bench.run --scenarios git_to_notion,daily_attendance --latency 0.05 --async
+python -m AI_study_automation.bench.run --sizes 10,100 --check-baseline     # 회귀 확인 (CI)
+python -m AI_study_automation.bench.run --sizes 10,100 --save-baseline      # 의도한 변경 후 기준 갱신
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+try:
+    from AI_study_automation.bench.fake_server import FakeServer
+except Exception:
+    from bench.fake_server import FakeServer
+
+SCENARIOS = ("git_to_notion", "daily_attendance", "notion_watch", "weekly_reminder")
+MEMBERS   = [f"member{i:02d}" for i in range(10)]
+ABSENT    = set(MEMBERS[-2:])          # 출석 시나리오에서 제출하지 않는 멤버
+
+PROB_DB, SUBS_DB, ATT_DB = "prob-db", "subs-db", "att-db"
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+BASELINE_KEYS = ("notion_requests", "discord_requests")   # 결정적인 값만 엄격 비교 (시간은 배수로)
+
+
+def _today():
+    # 스크립트와 같은 KST 기준 날짜
+    from datetime import timezone
+    return datetime.now(timezone(timedelta(hours=9)))
+
+
+def _rt(text):
+    return {"rich_text": [{"text": {"content": text}}]}
+
+
+def submission_paths(n):
+    """git_to_notion 입력: 멤버 10명에게 고르게 나눈 오늘자 파일 n개"""
+    day = _today().strftime("%Y-%m-%d")
+    return [f"study/{MEMBERS[i % len(MEMBERS)]}/{day}/prob{i:05d}.py" for i in range(n)]
+
+
+# ─────────────────────────────────────────────────────
+# 합성 데이터
+# ─────────────────────────────────────────────────────
+def seed(store, scenario, n):
+    now = _today()
+    day = now.strftime("%Y-%m-%d")
+    monday = (now - timedelta(days=now.weekday())).strftime("%Y-%m-%d")
+
+    if scenario == "git_to_notion":
+        # 절반은 이미 기록된 파일(update), 나머지는 신규(create). 멤버별 오늘 문제 카드 1장
+        for path in submission_paths(n)[: n // 2]:
+            name = path.split("/")[1]
+            store.create(SUBS_DB, {
+                "Name": {"title": [{"text": {"content": f"{day}_{name}"}}]},
+                "Week": {"date": {"start": day}}, "Submitter": _rt(name),
+                "Problem": _rt(path.rsplit("/", 1)[-1][:-3]), "File Path": _rt(path),
+                "Commit Time": {"date": {"start": now.isoformat()}}, "Status": {"select": {"name": "Submitted"}},
+            })
+        for m in MEMBERS:
+            store.create(PROB_DB, {"Name": {"title": [{"text": {"content": f"{m} 문제"}}]},
+                                   "Week": {"date": {"start": day}}, "Submitter": _rt(m),
+                                   "Status": {"select": {"name": "Assigned"}}})
+
+    elif scenario == "daily_attendance":
+        present = [m for m in MEMBERS if m not in ABSENT]
+        for i in range(n):
+            m = present[i % len(present)]
+            store.create(SUBS_DB, {
+                "Week": {"date": {"start": day}}, "Submitter": _rt(m), "Problem": _rt(f"prob{i:05d}"),
+                "Commit Time": {"date": {"start": (now - timedelta(minutes=i % 600)).isoformat()}},
+            })
+
+    elif scenario in ("notion_watch", "weekly_reminder"):
+        for i in range(n):
+            m = MEMBERS[i % len(MEMBERS)]
+            store.create(PROB_DB, {
+                "Name": {"title": [{"text": {"content": f"문제 {i:05d}"}}]},
+                "Week": {"date": {"start": monday}}, "Submitter": _rt(m),
+                "Next Submitters": _rt(MEMBERS[(i + 1) % len(MEMBERS)]),
+                "Link": {"url": f"https://example.com/p/{i}"},
+                "More Links": _rt(f"https://example.com/p/{i}/a, https://example.com/p/{i}/b"),
+                "Status": {"select": {"name": "Assigned"}},
+            })
+
+
+# ─────────────────────────────────────────────────────
+# Worker (자식 프로세스)
+# ─────────────────────────────────────────────────────
+def worker(scenario, n, out_path):
+    """ENV는 부모가 설정. 스크립트 출력은 버리고 main() 소요 시간만 기록"""
+    import contextlib
+    import importlib
+
+    t0 = time.perf_counter()
+    mod = importlib.import_module(f"AI_study_automation.scripts.{scenario}")
+    t_import = time.perf_counter() - t0
+
+    argv = [scenario]
+    if scenario == "git_to_notion":
+        argv += ["--event", "push", "--paths", " ".join(submission_paths(n))]
+    sys.argv = argv
+
+    error = None
+    t1 = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            mod.main()
+        except SystemExit as e:
+            error = None if e.code in (None, 0) else str(e.code)
+        except Exception as e:
+            error = repr(e)
+    t_main = time.perf_counter() - t1
+
+    from AI_study_automation.scripts import metrics
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"import_s": t_import, "main_s": t_main, "error": error, "metrics": metrics.summary()}, f)
+
+
+# ─────────────────────────────────────────────────────
+# Runner
+# ─────────────────────────────────────────────────────
+def run_case(srv, scenario, n, rate_limit, workdir, mirror=False, use_async=False):
+    srv.notion.dbs.clear()
+    srv.messages.clear()
+    seed(srv.notion, scenario, n)
+    srv.reset_stats()
+
+    state_dir = tempfile.mkdtemp(prefix=f"{scenario}-{n}-", dir=workdir)
+    out_path = os.path.join(state_dir, "result.json")
+    env = dict(
+        os.environ,
+        NOTION_API_KEY="bench", NOTION_API_BASE=srv.notion_base,
+        NOTION_DATABASE_ID=PROB_DB, NOTION_SUBMISSIONS_DB_ID=SUBS_DB, NOTION_ATTENDANCE_DB_ID=ATT_DB,
+        DISCORD_WEBHOOK_GIT_URL=srv.webhook_url("git"), DISCORD_WEBHOOK_NOTION_URL=srv.webhook_url("notion"),
+        DISCORD_WEBHOOK_URL_REMINDER=srv.webhook_url("reminder"),
+        NOTION_RATE_LIMIT=str(rate_limit), MEMBERS_CSV=",".join(MEMBERS), STATE_DIR=state_dir,
+        MEMBERS_MAP_PATH=os.path.join(state_dir, "no-members.json"),   # 파일 없음 → MEMBERS_CSV 사용
+        METRICS="1", GITHUB_STEP_SUMMARY="",
+        NOTION_MIRROR="1" if mirror else "0",   # 워크플로는 모두 미러 없이 실행
+        ASYNC_IO="1" if use_async else "0",
+    )
+    cmd = [sys.executable, "-m", "AI_study_automation.bench.run", "--worker", scenario, str(n), out_path]
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - t0
+
+    result = {"scenario": scenario, "size": n, "wall_s": round(wall, 3)}
+    try:
+        with open(out_path, encoding="utf-8") as f:
+            inner = json.load(f)
+        result.update(import_s=round(inner["import_s"], 3), main_s=round(inner["main_s"], 3), error=inner["error"],
+                      metrics=inner.get("metrics"))
+    except FileNotFoundError:
+        result["error"] = (proc.stderr.strip().splitlines() or ["worker crashed"])[-1]
+    stats = dict(srv.stats)
+    result.update(
+        notion_requests=stats.get("notion.requests", 0),
+        discord_requests=stats.get("discord.requests", 0),
+        throttled=stats.get("notion.429", 0) + stats.get("discord.429", 0),
+        bytes_in=stats.get("bytes_in", 0),
+        bytes_out=stats.get("bytes_out", 0),
+        routes={k[6:]: v for k, v in sorted(stats.items()) if k.startswith("route:")},
+    )
+    return result
+
+
+def print_table(results):
+    cols = ["scenario", "size", "wall_s", "main_s", "notion_requests", "discord_requests", "throttled", "bytes_in", "bytes_out", "error"]
+    rows = [[str(r.get(c, "") if r.get(c) is not None else "") for c in cols] for r in results]
+    widths = [max(len(c), *(len(row[i]) for row in rows)) for i, c in enumerate(cols)]
+    print("  ".join(c.ljust(w) for c, w in zip(cols, widths)))
+    for row in rows:
+        print("  ".join(v.ljust(w) for v, w in zip(row, widths)))
+
+
+# ─────────────────────────────────────────────────────
+# Baseline
+# ─────────────────────────────────────────────────────
+def _case_key(r):
+    return f"{r['scenario']}/{r['size']}"
+
+def save_baseline(results, options: dict, path=BASELINE_PATH):
+    """{"options": 실행 옵션, "cases": {"scenario/size": {wall_s, 요청 수...}}}"""
+    cases = {_case_key(r): {k: r.get(k) for k in ("wall_s", *BASELINE_KEYS)} for r in results if not r.get("error")}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"options": options, "cases": cases}, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"[BENCH] baseline saved: {path} ({len(cases)} case(s))", file=sys.stderr)
+
+def check_baseline(results, options: dict, path=BASELINE_PATH, max_slowdown=3.0) -> list:
+    """
+    기준 대비 회귀 목록 (문자열). 기준에 없는 케이스는 건너뜀
+    옵션(지연/429 주입/미러 등)이 기준과 다르면 요청 수도 시간도 비교할 수 없으므로 그 자체를 문제로 보고
+    """
+    with open(path, encoding="utf-8") as f:
+        base = json.load(f)
+    if base.get("options") != options:
+        return [f"options {options} differ from baseline {base.get('options')}"]
+    base = base["cases"]
+    problems = []
+    for r in results:
+        key = _case_key(r)
+        if r.get("error"):
+            problems.append(f"{key}: error {r['error']}")
+            continue
+        b = base.get(key)
+        if b is None:
+            continue
+        for k in BASELINE_KEYS:
+            if r.get(k, 0) > b[k]:
+                problems.append(f"{key}: {k} {r[k]} > baseline {b[k]}")
+        if max_slowdown and b.get("wall_s") and r["wall_s"] > b["wall_s"] * max_slowdown:
+            problems.append(f"{key}: wall_s {r['wall_s']} > {max_slowdown}x baseline {b['wall_s']}")
+    return problems
+
+
+def main():
+    if len(sys.argv) == 5 and sys.argv[1] == "--worker":
+        return worker(sys.argv[2], int(sys.argv[3]), sys.argv[4])
+
+    ap = argparse.ArgumentParser(description="offline benchmark for AI_study_automation scripts")
+    ap.add_argument("--sizes", default="10,100,1000,10000", help="쉼표로 구분한 데이터 크기")
+    ap.add_argument("--scenarios", default=",".join(SCENARIOS))
+    ap.add_argument("--latency", type=float, default=0.0, help="가짜 서버 요청당 지연(초)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="429 주입 확률")
+    ap.add_argument("--discord-bucket", default="", help="웹훅 버킷 한도 'N/초', 예: 5/2")
+    ap.add_argument("--rate-limit", type=float, default=1000.0, help="NOTION_RATE_LIMIT (기본: 사실상 무제한)")
+    ap.add_argument("--json", default="", help="결과를 JSON 파일로 저장")
+    ap.add_argument("--mirror", action="store_true", help="로컬 미러 사용 (NOTION_MIRROR=1, daemon/receiver 설정)")
+    ap.add_argument("--async", dest="use_async", action="store_true", help="ASYNC_IO=1 (git_to_notion, daily_attendance)")
+    ap.add_argument("--save-baseline", action="store_true", help=f"결과를 기준으로 저장 ({os.path.basename(BASELINE_PATH)})")
+    ap.add_argument("--check-baseline", action="store_true", help="기준과 비교해 회귀가 있으면 종료 코드 1")
+    ap.add_argument("--baseline", default=BASELINE_PATH, help="기준 파일 경로")
+    ap.add_argument("--max-slowdown", type=float, default=3.0, help="벽시계 시간 허용 배수 (0이면 시간은 비교 안 함)")
+    args = ap.parse_args()
+
+    bucket = None
+    if args.discord_bucket:
+        limit, window = args.discord_bucket.split("/")
+        bucket = (int(limit), float(window))
+
+    srv = FakeServer(latency=args.latency, error_rate=args.error_rate, discord_bucket=bucket).start()
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="study-bench-") as workdir:
+            for scenario in [s for s in args.scenarios.split(",") if s]:
+                if scenario not in SCENARIOS:
+                    raise SystemExit(f"unknown scenario: {scenario}")
+                for n in [int(x) for x in args.sizes.split(",") if x]:
+                    r = run_case(srv, scenario, n, args.rate_limit, workdir, mirror=args.mirror, use_async=args.use_async)
+                    results.append(r)
+                    print(f"[BENCH] {scenario} n={n}: {r['wall_s']}s notion={r['notion_requests']} discord={r['discord_requests']}"
+                          + (f" ERROR={r['error']}" if r.get("error") else ""), file=sys.stderr)
+    finally:
+        srv.stop()
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    options = {"latency": args.latency, "error_rate": args.error_rate, "discord_bucket": args.discord_bucket,
+               "rate_limit": args.rate_limit, "mirror": args.mirror, "async": args.use_async}
+    if args.save_baseline:
+        save_baseline(results, options, args.baseline)
+    if args.check_baseline:
+        problems = check_baseline(results, options, args.baseline, args.max_slowdown)
+        for p in problems:
+            print(f"[BENCH][REGRESSION] {p}", file=sys.stderr)
+        if problems:
+            return 1
+        print("[BENCH] no regression against baseline", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
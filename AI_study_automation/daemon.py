@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/daemon.py
+"""
+상주 스케줄러 (self-hosted 용)
+
+GitHub Actions cron 대신 프로세스 하나에서 세 작업을 예약 실행
+- notion_watch      : DAEMON_WATCH_MINUTES 분마다 (벽시계 기준 정각 정렬, cron "*/10"과 같음)
+- daily_attendance  : 매일 DAEMON_ATTENDANCE_AT (KST)
+- weekly_reminder   : 매주 DAEMON_REMINDER_AT (KST, "요일 HH:MM")
+
+스크립트 모듈은 시작할 때 한 번만 import 하므로 Notion/Discord 커넥션 풀,
+토큰 버킷, 로컬 미러, notion_watch 워터마크/지문 캐시가 실행 사이에 그대로 유지됨
+- 작업은 한 번에 하나씩 실행 (늦게 끝나면 밀린 작업을 바로 이어서 실행, 중복 실행은 하지 않음)
+- 작업 하나가 실패해도 데몬은 계속 동작
+- 작업마다 HTTP 계측 요약([METRICS])을 출력하고 초기화
+- SIGTERM/SIGINT: 실행 중인 작업을 마친 뒤 종료
+
+환경변수
+- DAEMON_WATCH_MINUTES    # (선택) 기본 10
+- DAEMON_ATTENDANCE_AT    # (선택) 기본 "23:59"
+- DAEMON_REMINDER_AT      # (선택) 기본 "wed 09:00"
+- 그 밖에 각 스크립트가 쓰는 NOTION_* / DISCORD_* 전부
+
+실행 예)
+python -m AI_study_automation.daemon
+python -m AI_study_automation.daemon --jobs notion_watch
+python -m AI_study_automation.daemon --once daily_attendance
+python -m AI_study_automation.daemon --list
+"""
+
+import argparse
+import importlib
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+
+try:
+    from AI_study_automation.scripts.utils import KST, load_env
+    from AI_study_automation.scripts import metrics
+    SCRIPTS_PKG = "AI_study_automation.scripts"
+except Exception:
+    from scripts.utils import KST, load_env
+    from scripts import metrics
+    SCRIPTS_PKG = "scripts"
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+# ─────────────────────────────────────────────────────
+# Schedules: now(KST) → 다음 실행 시각(KST, now 이후)
+# ─────────────────────────────────────────────────────
+def _hhmm(text: str):
+    h, m = text.strip().split(":")
+    return int(h), int(m)
+
+def every_minutes(minutes: int):
+    def next_run(now: datetime) -> datetime:
+        base = now.replace(second=0, microsecond=0)
+        step = minutes - base.minute % minutes
+        return base + timedelta(minutes=step)
+    return next_run
+
+def daily_at(hhmm: str):
+    h, m = _hhmm(hhmm)
+    def next_run(now: datetime) -> datetime:
+        at = now.replace(hour=h, minute=m, second=0, microsecond=0)
+        return at if at > now else at + timedelta(days=1)
+    return next_run
+
+def weekly_at(spec: str):
+    """'wed 09:00' 형식"""
+    day, hhmm = spec.split()
+    weekday = WEEKDAYS.index(day.strip().lower()[:3])
+    h, m = _hhmm(hhmm)
+    def next_run(now: datetime) -> datetime:
+        at = now.replace(hour=h, minute=m, second=0, microsecond=0) + timedelta(days=(weekday - now.weekday()) % 7)
+        return at if at > now else at + timedelta(days=7)
+    return next_run
+
+def default_schedules():
+    return {
+        "notion_watch":     every_minutes(int(os.environ.get("DAEMON_WATCH_MINUTES", "10"))),
+        "daily_attendance": daily_at(os.environ.get("DAEMON_ATTENDANCE_AT", "23:59")),
+        "weekly_reminder":  weekly_at(os.environ.get("DAEMON_REMINDER_AT", "wed 09:00")),
+    }
+
+
+# ─────────────────────────────────────────────────────
+# Runner
+# ─────────────────────────────────────────────────────
+def load_job(name: str):
+    """스크립트 모듈 import (최초 1회) + configure(). 필수 ENV가 없으면 여기서 바로 실패"""
+    module = importlib.import_module(f"{SCRIPTS_PKG}.{name}")
+    module.configure()
+    return module
+
+def run_job(name: str, module) -> bool:
+    """module.main() 실행. 성공 여부 반환 (예외/비정상 SystemExit은 기록만)"""
+    started = time.perf_counter()
+    argv, sys.argv = sys.argv, [name]   # 데몬 인자가 스크립트 argparse로 새지 않도록
+    ok = True
+    print(f"[DAEMON] {name} start {datetime.now(KST).isoformat(timespec='seconds')}", flush=True)
+    try:
+        module.main()
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            ok = False
+            print(f"[DAEMON][ERROR] {name} exited: {e.code}")
+    except Exception:
+        ok = False
+        print(f"[DAEMON][ERROR] {name} failed:\n{traceback.format_exc()}")
+    finally:
+        sys.argv = argv
+        metrics.emit_summary()
+        metrics.reset()
+    print(f"[DAEMON] {name} {'done' if ok else 'FAILED'} in {time.perf_counter() - started:.2f}s", flush=True)
+    return ok
+
+def serve(schedules: dict, stop: threading.Event):
+    modules = {name: load_job(name) for name in schedules}
+    now = datetime.now(KST)
+    due = {name: next_run(now) for name, next_run in schedules.items()}
+    for name, at in sorted(due.items(), key=lambda x: x[1]):
+        print(f"[DAEMON] {name} next at {at.isoformat(timespec='minutes')}")
+
+    while not stop.is_set():
+        name = min(due, key=due.get)
+        wait = (due[name] - datetime.now(KST)).total_seconds()
+        # 긴 대기도 1분 단위로 끊어 시계 변경(NTP 보정 등)에 따라감
+        if wait > 0 and stop.wait(min(wait, 60)):
+            break
+        if due[name] > datetime.now(KST):
+            continue
+        run_job(name, modules[name])
+        due[name] = schedules[name](datetime.now(KST))
+
+
+# ─────────────────────────────────────────────────────
+# Main
+# ─────────────────────────────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="AI_study_automation scheduler")
+    ap.add_argument("--jobs", default="", help="쉼표로 구분한 작업만 실행 (기본: 전부)")
+    ap.add_argument("--once", default="", metavar="JOB", help="작업 하나를 지금 한 번 실행하고 종료")
+    ap.add_argument("--list", action="store_true", help="작업별 다음 실행 시각만 출력")
+    args = ap.parse_args()
+
+    load_env()
+    schedules = default_schedules()
+    if args.once:
+        if args.once not in schedules:
+            raise SystemExit(f"unknown job: {args.once} (choose from {', '.join(schedules)})")
+        raise SystemExit(0 if run_job(args.once, load_job(args.once)) else 1)
+
+    if args.jobs:
+        names = [j.strip() for j in args.jobs.split(",") if j.strip()]
+        unknown = [j for j in names if j not in schedules]
+        if unknown:
+            raise SystemExit(f"unknown job(s): {', '.join(unknown)}")
+        schedules = {name: schedules[name] for name in names}
+
+    if args.list:
+        now = datetime.now(KST)
+        for name, next_run in schedules.items():
+            print(f"{name:<18} {next_run(now).isoformat(timespec='minutes')}")
+        return
+
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+    serve(schedules, stop)
+    print("[DAEMON] stopped")
+
+
+if __name__ == "__main__":
+    main()
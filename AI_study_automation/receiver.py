@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/receiver.py
+"""
+GitHub 웹훅 수신기 (git-to-notion 워크플로우 대체, self-hosted 용)
+
+- POST /github 로 push / pull_request 이벤트를 받아 바로 202 응답
+- push: 기본 브랜치로 들어온 payload.commits[].added/modified 중 study/ 경로만 사용
+  (경로별 커밋 시각/해시는 그 경로를 마지막으로 건드린 커밋 기준)
+- pull_request: payload에는 파일 목록이 없어 GitHub API(pulls/{n}/files)로 조회
+- 모은 경로는 디바운스 큐에 쌓였다가 DEBOUNCE_SECONDS 동안 새 이벤트가 없으면
+  (또는 첫 이벤트 후 DEBOUNCE_MAX_SECONDS가 지나면) 한 번에 처리:
+  배치 업서트 → (머지된 것만) 문제 DB 정리 → 오늘 롤업 Discord 전송 1회
+- X-Hub-Signature-256 을 GITHUB_WEBHOOK_SECRET 으로 검증
+
+환경변수
+- GITHUB_WEBHOOK_SECRET   # 웹훅 시크릿 (없으면 서명 검증 없이 받음, 로컬 테스트용)
+- GITHUB_TOKEN            # (선택) PR 파일 목록 조회용 (비공개 저장소)
+- RECEIVER_HOST           # (선택) 기본 127.0.0.1
+- RECEIVER_PORT           # (선택) 기본 8787
+- DEBOUNCE_SECONDS        # (선택) 기본 15
+- DEBOUNCE_MAX_SECONDS    # (선택) 기본 60
+- 그 밖에 git_to_notion 이 쓰는 NOTION_* / DISCORD_WEBHOOK_GIT_URL
+
+실행 예)
+python -m AI_study_automation.receiver
+python -m AI_study_automation receiver --port 9000 --debounce 5
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import signal
+import threading
+import time
+import traceback
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    from AI_study_automation.scripts.utils import KST, load_env
+    from AI_study_automation.scripts import git_to_notion as g2n
+    from AI_study_automation.scripts import metrics
+    from AI_study_automation.scripts.metrics import traced
+except Exception:
+    from scripts.utils import KST, load_env
+    from scripts import git_to_notion as g2n
+    from scripts import metrics
+    from scripts.metrics import traced
+
+# import 시에는 읽지 않고 configure()에서 읽음 (--help는 설정/.env 없이 끝남)
+WEBHOOK_SECRET   = ""
+GITHUB_TOKEN     = ""
+GITHUB_API       = "https://api.github.com"
+RECEIVER_HOST    = "127.0.0.1"
+RECEIVER_PORT    = 8787
+DEBOUNCE_SECONDS = 15.0
+DEBOUNCE_MAX     = 60.0
+
+def configure():
+    """ENV(.env 포함) → 모듈 설정 + git_to_notion.configure() (필수 값이 없으면 RuntimeError)"""
+    global WEBHOOK_SECRET, GITHUB_TOKEN, GITHUB_API, RECEIVER_HOST, RECEIVER_PORT, DEBOUNCE_SECONDS, DEBOUNCE_MAX
+    load_env()
+    WEBHOOK_SECRET   = os.environ.get("GITHUB_WEBHOOK_SECRET", "")
+    GITHUB_TOKEN     = os.environ.get("GITHUB_TOKEN", "")
+    GITHUB_API       = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+    RECEIVER_HOST    = os.environ.get("RECEIVER_HOST", "127.0.0.1")
+    RECEIVER_PORT    = int(os.environ.get("RECEIVER_PORT", "8787"))
+    DEBOUNCE_SECONDS = float(os.environ.get("DEBOUNCE_SECONDS", "15"))
+    DEBOUNCE_MAX     = float(os.environ.get("DEBOUNCE_MAX_SECONDS", "60"))
+    g2n.configure()
+
+PR_ACTIONS = {"opened", "synchronize", "reopened", "closed"}
+
+
+# ─────────────────────────────────────────────────────
+# Payload → 변경 경로
+# ─────────────────────────────────────────────────────
+# 경로 하나의 처리 정보 (나중에 들어온 이벤트가 덮어씀, merged는 한 번이라도 True면 유지)
+def change_info(commit_dt_kst, sha, repo, ref, pr_url=None, merged=True) -> dict:
+    return {"dt": commit_dt_kst, "sha": sha, "repo": repo, "ref": ref, "pr_url": pr_url, "merged": merged}
+
+def push_changes(payload) -> dict:
+    """push payload → {path: change_info}. 기본 브랜치 push가 아니면 빈 dict"""
+    repo = payload.get("repository") or {}
+    ref = payload.get("ref", "")
+    if ref != f"refs/heads/{repo.get('default_branch', 'main')}":
+        return {}
+    out = {}
+    for c in payload.get("commits") or []:
+        dt = datetime.fromisoformat(c["timestamp"].replace("Z", "+00:00")).astimezone(KST)
+        for path in (c.get("added") or []) + (c.get("modified") or []):
+            if g2n.PATH_RE.match(path):
+                out[path] = change_info(dt, c.get("id"), repo.get("full_name"), ref)
+    return out
+
+def pr_files(full_name: str, number: int) -> list:
+    """PR 변경 파일 목록 (삭제 제외). GitHub API, 페이지당 100개"""
+    import requests
+    headers = {"Accept": "application/vnd.github+json"}
+    if GITHUB_TOKEN:
+        headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
+    files, page = [], 1
+    while True:
+        r = requests.get(f"{GITHUB_API}/repos/{full_name}/pulls/{number}/files",
+                         params={"per_page": 100, "page": page}, headers=headers, timeout=20)
+        r.raise_for_status()
+        batch = r.json()
+        files += [f["filename"] for f in batch if f.get("status") != "removed"]
+        if len(batch) < 100:
+            return files
+        page += 1
+
+def pull_request_changes(payload) -> dict:
+    """pull_request payload → {path: change_info} (opened/synchronize/reopened/closed+merged)"""
+    pr = payload.get("pull_request") or {}
+    action = payload.get("action")
+    merged = bool(pr.get("merged"))
+    if action not in PR_ACTIONS or (action == "closed" and not merged):
+        return {}
+    repo = (payload.get("repository") or {}).get("full_name")
+    head = pr.get("head") or {}
+    now = datetime.now(KST)
+    return {
+        path: change_info(now, head.get("sha"), repo, head.get("ref"), pr.get("html_url"), merged)
+        for path in pr_files(repo, pr["number"]) if g2n.PATH_RE.match(path)
+    }
+
+def verify_signature(body: bytes, header: str) -> bool:
+    if not WEBHOOK_SECRET:
+        return True
+    expected = "sha256=" + hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, header or "")
+
+
+# ─────────────────────────────────────────────────────
+# Debounce queue
+# ─────────────────────────────────────────────────────
+class Debouncer:
+    """
+    {key: value} 를 모았다가 조용해지면 flush(batch) 한 번 호출 (별도 스레드 하나)
+    - 마지막 add 이후 window초 동안 추가가 없거나, 첫 add 이후 max_wait초가 지나면 flush
+    - 같은 key는 merge(old, new) 결과로 합침
+    - flush 중에 들어온 항목은 다음 배치로
+    """
+    def __init__(self, flush, window: float, max_wait: float, merge=None):
+        self.flush = flush
+        self.window = window
+        self.max_wait = max_wait
+        self.merge = merge or (lambda old, new: new)
+        self._cv = threading.Condition()
+        self._pending = {}
+        self._first = self._last = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name="debouncer", daemon=True)
+        self._thread.start()
+
+    def add(self, items: dict):
+        if not items:
+            return
+        with self._cv:
+            now = time.monotonic()
+            if not self._pending:
+                self._first = now
+            self._last = now
+            for k, v in items.items():
+                self._pending[k] = self.merge(self._pending[k], v) if k in self._pending else v
+            self._cv.notify()
+
+    def _due_in(self) -> float:
+        now = time.monotonic()
+        return min(self._last + self.window, self._first + self.max_wait) - now
+
+    def _loop(self):
+        while True:
+            with self._cv:
+                while not self._closed and (not self._pending or self._due_in() > 0):
+                    self._cv.wait(self._due_in() if self._pending else None)
+                if not self._pending:
+                    return   # closed
+                batch, self._pending = self._pending, {}
+            try:
+                self.flush(batch)
+            except Exception:
+                print(f"[RECEIVER][ERROR] flush failed:\n{traceback.format_exc()}")
+
+    def close(self):
+        """남은 항목을 바로 처리하고 스레드 종료"""
+        with self._cv:
+            self._closed = True
+            self._cv.notify()
+        self._thread.join()
+
+
+def merge_change(old: dict, new: dict) -> dict:
+    out = dict(new)
+    out["merged"] = old["merged"] or new["merged"]
+    out["pr_url"] = new["pr_url"] or old["pr_url"]
+    return out
+
+@traced("receiver.batch")
+def process_batch(batch: dict):
+    """
+    디바운스된 {path: change_info} 한 묶음 처리
+    - (repo, ref, pr_url) 단위로 배치 업서트 (경로별 커밋 시각/해시 사용)
+    - 머지된 경로만 문제 DB 정리, 마지막에 롤업 1회
+    """
+    started = time.perf_counter()
+    groups = {}
+    for path, info in batch.items():
+        groups.setdefault((info["repo"], info["ref"], info["pr_url"]), {})[path] = info
+
+    merged_results, all_results, all_commits = [], [], {}
+    for (repo, ref, pr_url), infos in groups.items():
+        changes = g2n.parse_changed_paths(list(infos))
+        commits = {path: (info["dt"], info["sha"]) for path, info in infos.items()}
+        results = g2n.upsert_submissions(changes, commit_dt_kst=None, repo=repo, branch=ref, pr_url=pr_url, commits=commits)
+        g2n.report_results(results)
+        all_results += results
+        all_commits.update(commits)
+        merged_results += [r for r in results if infos[r[0][3]]["merged"]]
+    if merged_results:
+        g2n.reconcile_problems(merged_results)
+    g2n.post_rollup(all_results, commits=all_commits)
+    print(f"[RECEIVER] batch of {len(batch)} path(s) done in {time.perf_counter() - started:.2f}s", flush=True)
+    metrics.emit_summary()
+    metrics.reset()
+
+
+# ─────────────────────────────────────────────────────
+# HTTP
+# ─────────────────────────────────────────────────────
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, text: str = ""):
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.wfile.flush()
+
+    def do_GET(self):
+        self._reply(200 if self.path == "/healthz" else 404, "ok" if self.path == "/healthz" else "")
+
+    def do_POST(self):
+        if self.path.split("?", 1)[0] != "/github":
+            return self._reply(404)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if not verify_signature(body, self.headers.get("X-Hub-Signature-256")):
+            return self._reply(401, "bad signature")
+        event = self.headers.get("X-GitHub-Event", "")
+        if event == "ping":
+            return self._reply(200, "pong")
+        if event not in ("push", "pull_request"):
+            return self._reply(204)
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return self._reply(400, "invalid json")
+
+        # GitHub은 10초 안에 응답을 기대하므로 먼저 응답하고, 파일 목록 조회는 이 스레드에서 이어서
+        self._reply(202, "accepted")
+        try:
+            changes = push_changes(payload) if event == "push" else pull_request_changes(payload)
+        except Exception as e:
+            print(f"[RECEIVER][ERROR] {event}: {e!r}")
+            return
+        if changes:
+            print(f"[RECEIVER] {event}: {len(changes)} study/ path(s) queued", flush=True)
+            self.server.queue.add(changes)
+
+
+def serve(host: str = None, port: int = None, window: float = None, max_wait: float = None):
+    """
+    HTTP 서버 생성 (httpd.queue = 디바운스 큐). serve_forever()는 호출부에서
+    설정은 여기서 읽음 → 필수 ENV가 없으면 첫 이벤트가 아니라 시작할 때 실패. 인자를 주면 ENV 대신 사용
+    """
+    configure()
+    httpd = ThreadingHTTPServer((host or RECEIVER_HOST, port if port is not None else RECEIVER_PORT), _Handler)
+    httpd.queue = Debouncer(process_batch, window if window is not None else DEBOUNCE_SECONDS,
+                            max_wait if max_wait is not None else DEBOUNCE_MAX, merge=merge_change)
+    return httpd
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="GitHub 웹훅 수신기 (study/ 제출 → Notion + 오늘 롤업)")
+    ap.add_argument("--host", default=None, help="기본 RECEIVER_HOST (127.0.0.1)")
+    ap.add_argument("--port", type=int, default=None, help="기본 RECEIVER_PORT (8787)")
+    ap.add_argument("--debounce", type=float, default=None, metavar="SECONDS", help="기본 DEBOUNCE_SECONDS (15)")
+    ap.add_argument("--max-wait", type=float, default=None, metavar="SECONDS", help="기본 DEBOUNCE_MAX_SECONDS (60)")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    httpd = serve(args.host, args.port, args.debounce, args.max_wait)
+    if not WEBHOOK_SECRET:
+        print("[RECEIVER][WARN] GITHUB_WEBHOOK_SECRET is not set; signatures are not verified")
+    print(f"[RECEIVER] listening on http://{httpd.server_address[0]}:{httpd.server_address[1]}/github "
+          f"(debounce {httpd.queue.window:g}s, max {httpd.queue.max_wait:g}s)", flush=True)
+
+    def shutdown(*_):
+        threading.Thread(target=httpd.shutdown).start()
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    httpd.serve_forever()
+    httpd.server_close()
+    httpd.queue.close()   # 남은 이벤트 처리 후 종료
+    print("[RECEIVER] stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/scripts/aio.py
+"""
+asyncio 진입점용 얇은 층 (HTTP 엔진은 따로 두지 않음)
+
+- call(fn, ...): 동기 함수를 작업 스레드에서 실행하고 await
+  → Notion/Discord 호출은 공용 동기 클라이언트(get_client / get_discord_sender) 그대로라
+    재시도·백오프·429 처리·계측(metrics)·토큰 버킷을 동기 경로와 한 곳에서 공유
+- 동시에 도는 호출 수는 이벤트 루프당 세마포어 하나로 제한 (속도 제한은 그대로 토큰 버킷)
+- gather_settled(fn, items): run_parallel의 asyncio 버전 [(item, result, error), ...]
+
+환경변수
+- NOTION_CONCURRENCY   # (선택) 동시 호출 수, 기본 4
+"""
+
+import asyncio
+import os
+import weakref
+
+_semaphores = weakref.WeakKeyDictionary()   # 이벤트 루프 → Semaphore
+
+
+def _semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sem = _semaphores.get(loop)
+    if sem is None:
+        sem = _semaphores[loop] = asyncio.Semaphore(int(os.environ.get("NOTION_CONCURRENCY", "4")))
+    return sem
+
+
+async def call(fn, *args, **kwargs):
+    """fn(*args, **kwargs)를 작업 스레드에서 실행 (contextvars 계측 라벨 유지)"""
+    async with _semaphore():
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+async def gather_settled(fn, items):
+    """
+    items 각각에 await fn(item)을 동시에 실행
+    예외는 삼키지 않고 결과에 담아 돌려줌: [(item, result, error), ...] (입력 순서 유지)
+    """
+    async def one(item):
+        try:
+            return item, await fn(item), None
+        except Exception as e:
+            return item, None, e
+    return list(await asyncio.gather(*(one(it) for it in items)))
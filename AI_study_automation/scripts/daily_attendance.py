@@ -1,50 +1,44 @@
 # -*- coding: utf-8 -*-
 # AI_study_automation/scripts/daily_attendance.py
-import os, json, requests
-from datetime import datetime, timedelta, timezone
+import os, argparse, asyncio
+from datetime import datetime, timedelta
 
 try:
-    from AI_study_automation.scripts.utils import get_env, post_discord, KST
+    from AI_study_automation.scripts.utils import get_env, post_discord, run_parallel, split_content, KST
+    from AI_study_automation.scripts.notion_client import get_client
+    from AI_study_automation.scripts.metrics import traced
+    from AI_study_automation.scripts.notion_mirror import get_mirror
+    from AI_study_automation.scripts.members import get_directory
+    from AI_study_automation.scripts.schema import get_decoder, ATTENDANCE, SUBMISSIONS
+    from AI_study_automation.scripts import aio
 except Exception:
-    from scripts.utils import get_env, post_discord, KST
+    from scripts.utils import get_env, post_discord, run_parallel, split_content, KST
+    from scripts.notion_client import get_client
+    from scripts.metrics import traced
+    from scripts.notion_mirror import get_mirror
+    from scripts.members import get_directory
+    from scripts.schema import get_decoder, ATTENDANCE, SUBMISSIONS
+    from scripts import aio
 
-NOTION_API_KEY            = get_env("NOTION_API_KEY")
-NOTION_SUBMISSIONS_DB_ID  = get_env("NOTION_SUBMISSIONS_DB_ID")
-DISCORD_WEBHOOK_URL       = get_env("DISCORD_WEBHOOK_NOTION_URL")  # 요약은 노션 채널로
-ATTENDANCE_DB_ID          = get_env("NOTION_ATTENDANCE_DB_ID", "")   # 선택(없으면 기록 스킵)
-MEMBERS_MAP_PATH          = os.path.join(os.path.dirname(__file__), "..", "config", "members.json")
+# import 시에는 읽지 않고 configure()에서 읽음
+NOTION_API_KEY = NOTION_SUBMISSIONS_DB_ID = DISCORD_WEBHOOK_URL = None
+ATTENDANCE_DB_ID          = ""
+NOTION_WORKERS            = 4
+ASYNC_IO                  = False
 
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_API_KEY}",
-    "Notion-Version": "2022-06-28",
-    "Content-Type": "application/json"
-}
+def configure():
+    """ENV(.env 포함) → 모듈 설정. 필수 값이 없으면 RuntimeError"""
+    global NOTION_API_KEY, NOTION_SUBMISSIONS_DB_ID, DISCORD_WEBHOOK_URL, ATTENDANCE_DB_ID, NOTION_WORKERS, ASYNC_IO
+    NOTION_API_KEY            = get_env("NOTION_API_KEY")
+    NOTION_SUBMISSIONS_DB_ID  = get_env("NOTION_SUBMISSIONS_DB_ID")
+    DISCORD_WEBHOOK_URL       = get_env("DISCORD_WEBHOOK_NOTION_URL")  # 요약은 노션 채널로
+    ATTENDANCE_DB_ID          = get_env("NOTION_ATTENDANCE_DB_ID", "")   # 선택(없으면 기록 스킵)
+    NOTION_WORKERS            = int(os.environ.get("NOTION_WORKERS", "4"))          # 동시 쓰기 스레드 수
+    ASYNC_IO                  = os.environ.get("ASYNC_IO", "0") == "1"              # asyncio 진입점 사용 (--async와 같음)
 
 def load_members():
-    # members.json 의 key를 멤버명으로 사용 (["재성","성미",...])
-    try:
-        with open(MEMBERS_MAP_PATH, "r", encoding="utf-8") as f:
-            raw = json.load(f)
-        return list(raw.keys())
-    except FileNotFoundError:
-        # fallback: ENV MEMBERS_CSV="A,B,C"
-        csv = os.environ.get("MEMBERS_CSV","")
-        return [s.strip() for s in csv.split(",") if s.strip()]
-
-def notion_query(dbid, payload):
-    url = f"https://api.notion.com/v1/databases/{dbid}/query"
-    r = requests.post(url, headers=HEADERS, json=payload, timeout=30)
-    if r.status_code >= 400:
-        print("[NOTION][ERROR]", r.status_code, r.text[:300])
-    r.raise_for_status()
-    return r.json()
-
-def notion_create(dbid, props):
-    url = "https://api.notion.com/v1/pages"
-    r = requests.post(url, headers=HEADERS, json={"parent":{"database_id":dbid},"properties":props}, timeout=30)
-    if r.status_code >= 400:
-        print("[NOTION][CREATE][ERROR]", r.status_code, r.text[:300])
-    r.raise_for_status()
+    # members.json 의 key(표시 이름)를 멤버명으로 사용 (["재성","성미",...]), 없으면 MEMBERS_CSV
+    return get_directory().names
 
 def props_attendance(name, date_str, status, first_time=None):
     props = {
@@ -57,30 +51,115 @@ def props_attendance(name, date_str, status, first_time=None):
         props["First Submit Time"] = {"date":{"start": first_time}}
     return props
 
-def main():
-    if not NOTION_API_KEY or not NOTION_SUBMISSIONS_DB_ID:
-        raise RuntimeError("Missing NOTION_API_KEY or NOTION_SUBMISSIONS_DB_ID")
+def _same_instant(a, b) -> bool:
+    """Notion이 돌려주는 ISO 표기(.000, Z 등)가 달라도 같은 시각이면 True"""
+    if not a or not b:
+        return not a and not b
+    try:
+        return datetime.fromisoformat(a.replace("Z","+00:00")) == datetime.fromisoformat(b.replace("Z","+00:00"))
+    except ValueError:
+        return a == b
 
-    today = datetime.now(KST)
-    date_str = today.strftime("%Y-%m-%d")
+ATTENDANCE_PROPS = ["Date", "Member", "Status", "First Submit Time"]
 
-    # 오늘자 제출자 목록
-    q = {"filter":{"property":"Week","date":{"equals":date_str}}, "page_size":200}
-    res = notion_query(NOTION_SUBMISSIONS_DB_ID, q)
+def index_attendance(pages, by_date=False):
+    """출석 행 → {Member: (page_id, Status, First Submit Time)} (by_date=True면 {Date: {Member: ...}})"""
+    out = {}
+    for rec in get_decoder(ATTENDANCE, ATTENDANCE_PROPS).decode(pages):
+        rows = out.setdefault((rec.date or "")[:10], {}) if by_date else out
+        if rec.member and rec.member not in rows:
+            rows[rec.member] = (rec.id, rec.status, rec.first_submit_time)
+    return out
+
+@traced("fetch_attendance_rows")
+def fetch_attendance_rows(date_str):
+    """출석 DB에서 해당 날짜 행을 한 번에 조회 → {Member: (page_id, Status, First Submit Time)}"""
+    return index_attendance(get_client().iter_query(ATTENDANCE_DB_ID, filter={"property":"Date","date":{"equals":date_str}}, props=ATTENDANCE_PROPS))
+
+def plan_attendance(existing, statuses):
+    """기존 행과 비교해 (counts, 쓸 작업 목록[(member, status, first_iso, page_id|None)])"""
+    counts = {"create": 0, "update": 0, "skip": 0, "error": 0}
+    tasks = []
+    for member, (status, first_iso) in statuses.items():
+        row = existing.get(member)
+        if row and row[1] == status and _same_instant(row[2], first_iso):
+            counts["skip"] += 1
+            continue
+        tasks.append((member, status, first_iso, row[0] if row else None))
+    return counts, tasks
+
+@traced("write_attendance")
+def write_attendance(date_str, statuses):
+    """
+    멱등 출석 기록: statuses {member: (status, first_iso)} 를 출석 DB에 반영
+    - 해당 날짜 기존 행을 조회 1회로 가져와 비교
+    - 없으면 create, 값이 다르면 update, 같으면 건너뜀 (재실행 시 쓰기 0회)
+    - 쓰기는 스레드 풀 + 공용 rate limiter
+    return: {"create": n, "update": n, "skip": n, "error": n}
+    """
+    counts, tasks = plan_attendance(fetch_attendance_rows(date_str), statuses)
+    return write_tasks([(date_str, t) for t in tasks], counts)
+
+def write_tasks(dated_tasks, counts):
+    """[(date_str, task), ...] 를 스레드 풀로 create/update, counts에 결과를 더해 반환"""
+    def write(item):
+        date_str, (member, status, first_iso, page_id) = item
+        props = props_attendance(member, date_str, status, first_iso)
+        if page_id:
+            if not first_iso:
+                props["First Submit Time"] = {"date": None}
+            get_client().update(page_id, props)
+            return "update"
+        get_client().create(ATTENDANCE_DB_ID, props)
+        return "create"
+
+    for (date_str, task), op, err in run_parallel(write, dated_tasks, NOTION_WORKERS):
+        if err is not None:
+            counts["error"] += 1
+            print("[NOTION][ATTENDANCE][WARN]", date_str, task[0], repr(err))
+        else:
+            counts[op] += 1
+    return counts
+
+@traced("query_day_submissions")
+def query_day_submissions(date_str):
+    """해당 날짜(Week) 제출 → (Submitter, Commit Time) 을 Commit Time 오름차순으로 yield"""
+    mirror = get_mirror()
+    if mirror is not None:
+        mirror.sync(NOTION_SUBMISSIONS_DB_ID, SUBMISSIONS)
+        for r in mirror.pages_on(NOTION_SUBMISSIONS_DB_ID, date_str, order_by="commit_time"):
+            yield r["submitter"], r["commit_time"]
+        return
+
+    pages = get_client().iter_query(
+        NOTION_SUBMISSIONS_DB_ID,
+        filter={"property":"Week","date":{"equals":date_str}},
+        sorts=[{"property":"Commit Time","direction":"ascending"}],
+        props=SUBMISSION_PROPS,
+    )
+    for rec in get_decoder(SUBMISSIONS, SUBMISSION_PROPS).decode(pages):
+        yield rec.submitter, rec.commit_time
+
+SUBMISSION_PROPS = ["Week", "Submitter", "Commit Time"]
+
+def summarize(date_str, submissions, members):
+    """
+    (Submitter, Commit Time) 목록(시각 오름차순) → (요약 메시지 줄, {member: (status, first_iso)})
+    - Submitter(폴더 이름/별칭)는 멤버 디렉터리의 표시 이름으로 맞춰 비교
+    """
+    directory = get_directory()
     submitted = set()
     first_time_map = {}
-    for r in res.get("results",[]):
-        props = r.get("properties", {})
-        name = ((props.get("Submitter", {}) or {}).get("rich_text") or [{}])[0].get("plain_text","")
-        when = (props.get("Commit Time", {}) or {}).get("date", {}).get("start")
+    for name, when in submissions:
         if not name:
             continue
+        name = directory.canonical(name)
         submitted.add(name)
         if when and name not in first_time_map:
             first_time_map[name] = when
 
-    members = load_members()
     lines = [f"🗓️ {date_str} 출석 요약"]
+    statuses = {}
     for m in members:
         if m in submitted:
             t = first_time_map.get(m)
@@ -93,17 +172,181 @@ def main():
         else:
             lines.append(f"❌ {m} — 미참여(결석)")
             status = "Absent"
+        statuses[m] = (status, first_time_map.get(m))
+    return lines, statuses
+
+# ─────────────────────────────────────────────────────
+# Range mode (--from/--to): 여러 날을 조회 한 번으로 재계산
+# ─────────────────────────────────────────────────────
+def iter_days(start: str, end: str):
+    day = datetime.strptime(start, "%Y-%m-%d")
+    last = datetime.strptime(end, "%Y-%m-%d")
+    while day <= last:
+        yield day.strftime("%Y-%m-%d")
+        day += timedelta(days=1)
+
+def next_day(date_str: str) -> str:
+    return (datetime.strptime(date_str, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+
+def range_filter(prop, start, end):
+    """start <= prop < end 다음 날 (둘 다 YYYY-MM-DD, end 포함)"""
+    return {"and": [
+        {"property": prop, "date": {"on_or_after": start}},
+        {"property": prop, "date": {"before": next_day(end)}},
+    ]}
+
+@traced("query_range_submissions")
+def query_range_submissions(start, end):
+    """start~end(포함) 제출 → {date: [(Submitter, Commit Time), ...]} (날짜별 Commit Time 오름차순)"""
+    by_day = {}
+    mirror = get_mirror()
+    if mirror is not None:
+        mirror.sync(NOTION_SUBMISSIONS_DB_ID, SUBMISSIONS)
+        for r in mirror.pages_between(NOTION_SUBMISSIONS_DB_ID, start, next_day(end)):
+            by_day.setdefault(r["week"][:10], []).append((r["submitter"], r["commit_time"]))
+        for rows in by_day.values():
+            rows.sort(key=lambda x: x[1] or "")
+        return by_day
+
+    pages = get_client().iter_query(
+        NOTION_SUBMISSIONS_DB_ID,
+        filter=range_filter("Week", start, end),
+        sorts=[{"property":"Commit Time","direction":"ascending"}],
+        props=SUBMISSION_PROPS,
+    )
+    for rec in get_decoder(SUBMISSIONS, SUBMISSION_PROPS).decode(pages):
+        by_day.setdefault((rec.week or "")[:10], []).append((rec.submitter, rec.commit_time))
+    return by_day
+
+@traced("fetch_attendance_range")
+def fetch_attendance_range(start, end):
+    return index_attendance(get_client().iter_query(ATTENDANCE_DB_ID, filter=range_filter("Date", start, end), props=ATTENDANCE_PROPS), by_date=True)
+
+@traced("daily_attendance.range")
+def run_range(start, end):
+    """
+    start~end 출석 재계산
+    - 제출 DB 범위 조회 1회(페이지네이션) + 출석 DB 범위 조회 1회
+    - 날짜/멤버별로 메모리에서 나눠 모든 출석 행을 멱등 기록 (바뀐 행만 쓰기)
+    - 날짜별 한 줄 요약을 묶어 Discord로 전송 (길면 줄 단위로 나눠 여러 메시지, 잘리는 날짜 없음)
+    """
+    if not NOTION_API_KEY or not NOTION_SUBMISSIONS_DB_ID:
+        raise RuntimeError("Missing NOTION_API_KEY or NOTION_SUBMISSIONS_DB_ID")
+    today = datetime.now(KST).strftime("%Y-%m-%d")
+    if end > today:
+        print(f"[INFO] --to {end} is in the future; clipped to {today}")
+        end = today
+    if start > end:
+        raise SystemExit(f"empty range: {start}..{end}")
+
+    members = load_members()
+    by_day = query_range_submissions(start, end)
+    existing = {}
+    if ATTENDANCE_DB_ID:
+        try:
+            existing = fetch_attendance_range(start, end)
+        except Exception as e:
+            print("[NOTION][ATTENDANCE][WARN]", repr(e))
+            existing = None
 
-        # 기록 DB가 있으면 적재
-        if ATTENDANCE_DB_ID:
-            try:
-                first_iso = first_time_map.get(m)
-                notion_create(ATTENDANCE_DB_ID, props_attendance(m, date_str, status, first_iso))
-            except Exception as e:
-                print("[NOTION][ATTENDANCE][WARN]", repr(e))
+    lines = [f"🗓️ {start} ~ {end} 출석 재계산"]
+    counts = {"create": 0, "update": 0, "skip": 0, "error": 0}
+    dated_tasks = []
+    for day in iter_days(start, end):
+        _, statuses = summarize(day, by_day.get(day, []), members)
+        absent = [m for m, (status, _) in statuses.items() if status == "Absent"]
+        line = f"{day} ✅ {len(members) - len(absent)}/{len(members)}"
+        lines.append(line + (f" · 결석: {', '.join(absent)}" if absent else ""))
+        if existing is not None and ATTENDANCE_DB_ID:
+            day_counts, tasks = plan_attendance(existing.get(day, {}), statuses)
+            counts["skip"] += day_counts["skip"]
+            dated_tasks += [(day, t) for t in tasks]
+
+    if existing is not None and ATTENDANCE_DB_ID:
+        print("[NOTION][ATTENDANCE]", write_tasks(dated_tasks, counts))
+
+    webhook = os.environ.get("DISCORD_WEBHOOK_URL_REMINDER", DISCORD_WEBHOOK_URL)
+    for content in split_content(lines):
+        post_discord(webhook, content=content)
+
+def parse_args():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--from", dest="start", default="", metavar="YYYY-MM-DD", help="재계산 시작일 (--to와 함께)")
+    ap.add_argument("--to", dest="end", default="", metavar="YYYY-MM-DD", help="재계산 종료일(포함), 기본 오늘")
+    ap.add_argument("--async", dest="use_async", action="store_true",
+                    help="asyncio 진입점(오늘 모드): 조회 두 개와 기록/전송을 각각 동시에 (ENV ASYNC_IO=1과 같음)")
+    return ap.parse_args()
+
+@traced("daily_attendance.main")
+def main():
+    args = parse_args()
+    configure()
+    if args.start or args.end:
+        for d in (args.start, args.end):
+            if d:
+                datetime.strptime(d, "%Y-%m-%d")   # 형식 검증 (ValueError)
+        today = datetime.now(KST).strftime("%Y-%m-%d")
+        run_range(args.start or args.end, args.end or today)
+    elif args.use_async or ASYNC_IO:
+        asyncio.run(run_async())
+    else:
+        run_sync()
+
+def run_sync():
+    if not NOTION_API_KEY or not NOTION_SUBMISSIONS_DB_ID:
+        raise RuntimeError("Missing NOTION_API_KEY or NOTION_SUBMISSIONS_DB_ID")
+
+    today = datetime.now(KST)
+    date_str = today.strftime("%Y-%m-%d")
+
+    # 오늘자 제출자 목록
+    lines, statuses = summarize(date_str, query_day_submissions(date_str), load_members())
+
+    # 기록 DB가 있으면 적재 (이미 같은 값이면 쓰지 않음)
+    if ATTENDANCE_DB_ID:
+        try:
+            counts = write_attendance(date_str, statuses)
+            print("[NOTION][ATTENDANCE]", counts)
+        except Exception as e:
+            print("[NOTION][ATTENDANCE][WARN]", repr(e))
 
     webhook = os.environ.get("DISCORD_WEBHOOK_URL_REMINDER", DISCORD_WEBHOOK_URL)
     post_discord(webhook, content="\n".join(lines))
 
+async def run_async():
+    """
+    run_sync의 asyncio 버전
+    - 1단계: 오늘 제출 조회와 출석 DB 기존 행 조회를 동시에
+    - 2단계: 출석 행 쓰기와 Discord 요약 전송을 동시에 (요약은 쓰기 결과와 무관)
+    """
+    if not NOTION_API_KEY or not NOTION_SUBMISSIONS_DB_ID:
+        raise RuntimeError("Missing NOTION_API_KEY or NOTION_SUBMISSIONS_DB_ID")
+    date_str = datetime.now(KST).strftime("%Y-%m-%d")
+
+    async def existing_rows():
+        if not ATTENDANCE_DB_ID:
+            return None
+        try:
+            return await aio.call(fetch_attendance_rows, date_str)
+        except Exception as e:
+            print("[NOTION][ATTENDANCE][WARN]", repr(e))
+            return None
+
+    submissions, existing = await asyncio.gather(aio.call(lambda: list(query_day_submissions(date_str))), existing_rows())
+    lines, statuses = summarize(date_str, submissions, load_members())
+
+    async def record():
+        if existing is None:
+            return
+        counts, tasks = plan_attendance(existing, statuses)
+        print("[NOTION][ATTENDANCE]", await aio.call(write_tasks, [(date_str, t) for t in tasks], counts))
+
+    webhook = os.environ.get("DISCORD_WEBHOOK_URL_REMINDER", DISCORD_WEBHOOK_URL)
+    recorded, sent = await asyncio.gather(record(), aio.call(post_discord, webhook, content="\n".join(lines)), return_exceptions=True)
+    if isinstance(recorded, Exception):
+        print("[NOTION][ATTENDANCE][WARN]", repr(recorded))   # 기록 실패는 동기 경로처럼 경고만
+    if isinstance(sent, BaseException):
+        raise sent
+
 if __name__ == "__main__":
     main()
@@ -1,50 +1,123 @@
 # -*- coding: utf-8 -*-
 # AI_study_automation/scripts/git_to_notion.py
-import os, re, argparse, json, requests
-from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Tuple
+import os, re, sys, argparse, asyncio, subprocess
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Tuple, Iterable, Iterator
 
 try:
-    from AI_study_automation.scripts.utils import get_env, post_discord, KST
+    from AI_study_automation.scripts.utils import get_env, post_discord, run_parallel, KST, load_state, save_state, fingerprint, get_discord_sender, discord_payload
+    from AI_study_automation.scripts.notion_client import get_client
+    from AI_study_automation.scripts.metrics import traced
+    from AI_study_automation.scripts.notion_mirror import get_mirror
+    from AI_study_automation.scripts.schema import get_decoder, PROBLEMS, SUBMISSIONS
+    from AI_study_automation.scripts import aio
 except Exception:
-    from scripts.utils import get_env, post_discord, KST
+    from scripts.utils import get_env, post_discord, run_parallel, KST, load_state, save_state, fingerprint, get_discord_sender, discord_payload
+    from scripts.notion_client import get_client
+    from scripts.metrics import traced
+    from scripts.notion_mirror import get_mirror
+    from scripts.schema import get_decoder, PROBLEMS, SUBMISSIONS
+    from scripts import aio
 
 # ─────────────────────────────────────────────────────
 # ENV
 # ─────────────────────────────────────────────────────
-NOTION_API_KEY            = get_env("NOTION_API_KEY")
-NOTION_DATABASE_ID_PROB   = get_env("NOTION_DATABASE_ID")                 # 문제 DB
-NOTION_SUBMISSIONS_DB_ID  = get_env("NOTION_SUBMISSIONS_DB_ID")           # 제출 로그 DB
-DISCORD_WEBHOOK_URL       = get_env("DISCORD_WEBHOOK_GIT_URL")                # 제출 누적 알림 채널
-NOTION_DB_URL             = get_env("NOTION_DB_URL", "")
-DEADLINE_HOUR_KST         = int(os.environ.get("DEADLINE_HOUR_KST", "23"))
+# import 시에는 읽지 않고 configure()에서 읽음 (--help/할 일 없는 실행은 설정 없이 끝남)
+NOTION_API_KEY = NOTION_DATABASE_ID_PROB = NOTION_SUBMISSIONS_DB_ID = DISCORD_WEBHOOK_URL = None
+NOTION_DB_URL             = ""
+DEADLINE_HOUR_KST         = 23
+NOTION_WORKERS            = 4
+ROLLUP_EDIT               = True
+ROLLUP_STATE              = "daily_rollup"
+ASYNC_IO                  = False
 
-MEMBERS_MAP_PATH          = os.path.join(os.path.dirname(__file__), "..", "config", "members.json")
-
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_API_KEY}",
-    "Notion-Version": "2022-06-28",
-    "Content-Type": "application/json"
-}
+def configure():
+    """ENV(.env 포함) → 모듈 설정. 필수 값이 없으면 RuntimeError. 상주 프로세스는 실행마다 다시 불러도 됨"""
+    global NOTION_API_KEY, NOTION_DATABASE_ID_PROB, NOTION_SUBMISSIONS_DB_ID, DISCORD_WEBHOOK_URL, NOTION_DB_URL
+    global DEADLINE_HOUR_KST, NOTION_WORKERS, ROLLUP_EDIT, ASYNC_IO
+    NOTION_API_KEY            = get_env("NOTION_API_KEY")
+    NOTION_DATABASE_ID_PROB   = get_env("NOTION_DATABASE_ID")                 # 문제 DB
+    NOTION_SUBMISSIONS_DB_ID  = get_env("NOTION_SUBMISSIONS_DB_ID")           # 제출 로그 DB
+    DISCORD_WEBHOOK_URL       = get_env("DISCORD_WEBHOOK_GIT_URL")                # 제출 누적 알림 채널
+    NOTION_DB_URL             = get_env("NOTION_DB_URL", "")
+    DEADLINE_HOUR_KST         = int(os.environ.get("DEADLINE_HOUR_KST", "23"))
+    NOTION_WORKERS            = int(os.environ.get("NOTION_WORKERS", "4"))          # 동시 쓰기 스레드 수
+    ROLLUP_EDIT               = os.environ.get("ROLLUP_EDIT", "1") != "0"           # 하루 메시지 하나를 수정(0이면 매번 새 메시지)
+    ASYNC_IO                  = os.environ.get("ASYNC_IO", "0") == "1"              # asyncio 진입점 사용 (--async와 같음)
 
 # ─────────────────────────────────────────────────────
 # Helpers
 # ─────────────────────────────────────────────────────
-PATH_RE = re.compile(r"^study/([^/]+)/(\d{4}-\d{2}-\d{2})/(.+)$")
-
-def parse_changed_paths(paths: List[str]) -> List[Tuple[str,str,str,str]]:
-    """return list of (name, date, problem, path) from study/<name>/<YYYY-MM-DD>/<file>"""
-    found = []
-    for p in paths:
-        m = PATH_RE.match(p.strip())
-        if not m:
+PATH_RE = re.compile(r"^study/([^/]+)/(\d{4}-\d{2}-\d{2})/(.+)$", re.S)   # re.S: 파일명에 줄바꿈이 있어도 (-z 입력)
+
+def parse_changed_paths(paths: Iterable[str]) -> List[Tuple[str,str,str,str]]:
+    """
+    return list of (name, date, problem, path) from study/<name>/<YYYY-MM-DD>/<file>
+    paths는 스트림이어도 됨: 한 개씩 PATH_RE로 거르고 같은 경로는 한 번만 (남는 건 제출 경로뿐)
+    """
+    found, seen = [], set()
+    for raw in paths:
+        p = raw.strip()
+        m = PATH_RE.match(p)
+        if not m or p in seen:
             continue
+        seen.add(p)
         name, date_str, tail = m.groups()
         problem = tail.rsplit("/", 1)[-1]
         problem = problem.rsplit(".", 1)[0]
         found.append((name, date_str, problem, p))
     return found
 
+# ─────────────────────────────────────────────────────
+# Changed paths intake (--paths-file / --diff)
+# ─────────────────────────────────────────────────────
+def iter_nul_paths(stream, chunk_size: int = 1 << 16) -> Iterator[str]:
+    """
+    NUL 구분 경로 스트림(git diff -z 출력) → 경로를 하나씩 yield
+    청크 단위로 읽어 큰 머지(수천 파일)도 메모리는 청크 + 마지막 조각만. 공백/줄바꿈이 든 경로도 그대로
+    """
+    rest = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        *parts, rest = (rest + chunk).split(b"\0")
+        for part in parts:
+            if part:
+                yield os.fsdecode(part)
+    if rest:
+        yield os.fsdecode(rest)
+
+def iter_paths_file(path: str) -> Iterator[str]:
+    """--paths-file: 파일 또는 "-"(stdin)의 NUL 구분 경로"""
+    if path == "-":
+        yield from iter_nul_paths(sys.stdin.buffer)
+        return
+    with open(path, "rb") as f:
+        yield from iter_nul_paths(f)
+
+def iter_git_diff(spec: str, pathspec: str = ":/study/") -> Iterator[str]:
+    """
+    --diff: 변경 경로를 프로세스 안에서 직접 계산 (git diff -z --name-only <spec> -- :/study/)
+    spec은 "BASE...HEAD" 또는 "A B" (git diff에 그대로 넘김)
+    pathspec은 저장소 루트 기준이라 하위 폴더에서 실행해도 같은 경로 목록
+    """
+    cmd = ["git", "diff", "-z", "--name-only", *spec.split(), "--", pathspec]
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE) as proc:
+        yield from iter_nul_paths(proc.stdout)
+    if proc.returncode:
+        raise RuntimeError(f"git diff failed ({proc.returncode}): {' '.join(cmd)}")
+
+def iter_changed_paths(args) -> Iterator[str]:
+    """--paths(공백/쉼표 구분, 예전 방식) + --paths-file + --diff를 이어 붙인 경로 스트림"""
+    if args.paths:
+        raw = args.paths.replace("\r"," ").replace("\n"," ").replace(",", " ")
+        yield from (p for p in raw.split(" ") if p)
+    if args.paths_file:
+        yield from iter_paths_file(args.paths_file)
+    if args.diff:
+        yield from iter_git_diff(args.diff)
+
 def kst_now_iso():
     return datetime.now(KST).astimezone(timezone.utc).isoformat()
 
@@ -54,38 +127,6 @@ def to_kst(dt: datetime) -> datetime:
 def iso(dt: datetime) -> str:
     return dt.astimezone(timezone.utc).isoformat()
 
-def load_member_map() -> Dict[str,str]:
-    try:
-        with open(MEMBERS_MAP_PATH, "r", encoding="utf-8") as f:
-            raw = json.load(f)
-        return { (k or "").strip().lower(): (v or "").strip() for k,v in raw.items() if k and v }
-    except FileNotFoundError:
-        return {}
-
-def notion_query(dbid: str, payload: dict) -> dict:
-    url = f"https://api.notion.com/v1/databases/{dbid}/query"
-    r = requests.post(url, headers=HEADERS, json=payload, timeout=30)
-    if r.status_code >= 400:
-        print("[NOTION][QUERY][ERROR]", r.status_code, r.text[:300])
-    r.raise_for_status()
-    return r.json()
-
-def notion_create(dbid: str, props: dict) -> str:
-    url = "https://api.notion.com/v1/pages"
-    payload = {"parent": {"database_id": dbid}, "properties": props}
-    r = requests.post(url, headers=HEADERS, json=payload, timeout=30)
-    if r.status_code >= 400:
-        print("[NOTION][CREATE][ERROR]", r.status_code, r.text[:300])
-    r.raise_for_status()
-    return r.json().get("id")
-
-def notion_update(page_id: str, props: dict):
-    url = f"https://api.notion.com/v1/pages/{page_id}"
-    r = requests.patch(url, headers=HEADERS, json={"properties": props}, timeout=30)
-    if r.status_code >= 400:
-        print("[NOTION][UPDATE][ERROR]", r.status_code, r.text[:300])
-    r.raise_for_status()
-
 def props_submission(name, date_str, problem, commit_dt_kst, file_path, repo=None, branch=None, sha=None, pr_url=None, ontime=None, late_min=None):
     props = {
         "Name": {"title": [{"text": {"content": f"{date_str}_{name}"}}]},
@@ -108,68 +149,180 @@ def props_submission(name, date_str, problem, commit_dt_kst, file_path, repo=Non
         props["Late (min)"] = {"number": int(late_min)}
     return props
 
-def upsert_submission(name, date_str, problem, commit_dt_kst, file_path, repo=None, branch=None, sha=None, pr_url=None):
-    # 업서트 키: Week(date) + Submitter(text) + File Path(text)
-    q = {
-        "filter": {
-            "and": [
-                {"property": "Week", "date": {"equals": date_str}},
-                {"property": "Submitter", "rich_text": {"equals": name}},
-                {"property": "File Path", "rich_text": {"equals": file_path}},
-            ]
-        },
-        "page_size": 1
-    }
-    res = notion_query(NOTION_SUBMISSIONS_DB_ID, q)
+def lateness(date_str, commit_dt_kst) -> Tuple[bool, int]:
+    """(On-time 여부, 지연 분) — 마감: 해당 날짜 DEADLINE_HOUR_KST 정시"""
     deadline_kst = datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=KST, hour=DEADLINE_HOUR_KST, minute=0, second=0, microsecond=0)
     ontime = commit_dt_kst <= deadline_kst
     late_min = 0 if ontime else int((commit_dt_kst - deadline_kst).total_seconds() // 60)
+    return ontime, late_min
+
+def submission_group_filter(name, date_str) -> dict:
+    return {
+        "and": [
+            {"property": "Week", "date": {"equals": date_str}},
+            {"property": "Submitter", "rich_text": {"equals": name}},
+        ]
+    }
 
-    props = props_submission(name, date_str, problem, commit_dt_kst, file_path, repo, branch, sha, pr_url, ontime, late_min)
+def index_by_path(recs) -> Dict[str,str]:
+    """제출 레코드 → {File Path: page_id} (같은 경로가 여럿이면 먼저 나온 것)"""
+    index = {}
+    for rec in recs:
+        if rec.file_path and rec.file_path not in index:
+            index[rec.file_path] = rec.id
+    return index
 
-    if res.get("results"):
-        page_id = res["results"][0]["id"]
-        notion_update(page_id, props)
+@traced("fetch_submission_index")
+def fetch_submission_index(name, date_str) -> Dict[str,str]:
+    """(Week, Submitter) 그룹의 기존 제출 페이지를 한 번에 조회 → {File Path: page_id}"""
+    decode = get_decoder(SUBMISSIONS, ["File Path"])
+    return index_by_path(decode.decode(get_client().iter_query(NOTION_SUBMISSIONS_DB_ID, filter=submission_group_filter(name, date_str), props=decode.props)))
+
+def group_changes(changes) -> Dict[Tuple[str,str], Dict[str, Tuple[str,str,str,str]]]:
+    """(date, name) → {path: change}  (같은 경로 중복은 하나로)"""
+    groups: Dict[Tuple[str,str], Dict[str, Tuple[str,str,str,str]]] = {}
+    for change in changes:
+        name, date_str, _, file_path = change
+        groups.setdefault((date_str, name), {})[file_path] = change
+    return groups
+
+def write_props(change, commit_dt_kst, repo=None, branch=None, sha=None, pr_url=None, commits=None) -> dict:
+    name, date_str, problem, file_path = change
+    dt, sha_ = (commits or {}).get(file_path, (commit_dt_kst, sha))
+    ontime, late_min = lateness(date_str, dt)
+    return props_submission(name, date_str, problem, dt, file_path, repo, branch, sha_, pr_url, ontime, late_min)
+
+def write_submission(task, commit_dt_kst, repo=None, branch=None, sha=None, pr_url=None, commits=None):
+    """(change, 기존 page_id|None) → 있으면 update, 없으면 create. return: (page_id, "update"|"create")"""
+    change, page_id = task
+    props = write_props(change, commit_dt_kst, repo, branch, sha, pr_url, commits)
+    if page_id:
+        get_client().update(page_id, props)
         return page_id, "update"
-    else:
-        page_id = notion_create(NOTION_SUBMISSIONS_DB_ID, props)
-        return page_id, "create"
-
-def mark_problem_done_if_match(name, date_str):
-    # 문제 DB에서 Submitter contains name & Week equals date
-    q = {
-        "filter": {
-            "and": [
-                {"property": "Submitter", "rich_text": {"contains": name}},
-                {"property": "Week", "date": {"equals": date_str}}
-            ]
-        },
-        "page_size": 5
-    }
-    res = notion_query(NOTION_DATABASE_ID_PROB, q)
-    for p in res.get("results", []):
-        pid = p["id"]
-        st = (p.get("properties", {}).get("Status", {}).get("select") or {}).get("name")
-        if st == "Done":
+    return get_client().create(NOTION_SUBMISSIONS_DB_ID, props), "create"
+
+def submission_result(task, res, err):
+    """쓰기 결과 → ((name, date, problem, path), page_id, op, error)"""
+    change, page_id = task
+    if err is not None:
+        return change, page_id, "update" if page_id else "create", err
+    return change, res[0], res[1], None
+
+@traced("upsert_submissions")
+def upsert_submissions(changes, commit_dt_kst, repo=None, branch=None, sha=None, pr_url=None, workers=None, commits=None):
+    """
+    배치 업서트: parse_changed_paths 결과를 (Week, Submitter)로 묶어
+    그룹당 조회 1회(페이지네이션) + 파일별 create/update만 호출
+    - commits: {path: (commit_dt_kst, sha)} 가 있으면 파일별 커밋 시각/해시를 사용 (backfill)
+    - 조회/쓰기 모두 스레드 풀(workers, 기본 NOTION_WORKERS)로 병렬 실행, 속도는 공용 rate limiter가 제한
+    - 경로당 쓰기는 한 번뿐이라 같은 페이지에 대한 요청 순서가 뒤섞이지 않음
+    - 개별 실패는 중단하지 않고 결과에 담음
+    return: [((name, date, problem, path), page_id, "create"|"update", error), ...]
+    """
+    workers = workers or NOTION_WORKERS
+    groups = group_changes(changes)
+
+    results = []
+    tasks = []
+    for (date_str, name), index, err in run_parallel(lambda g: fetch_submission_index(g[1], g[0]), groups, workers):
+        if err is not None:
+            results += [(change, None, "query", err) for change in groups[(date_str, name)].values()]
             continue
-        notion_update(pid, {"Status": {"select": {"name": "Done"}}})
+        for file_path, change in groups[(date_str, name)].items():
+            tasks.append((change, index.get(file_path)))
 
-def query_today_submissions_kst(today_kst: datetime):
-    date_str = today_kst.strftime("%Y-%m-%d")
-    q = {
-        "filter": {"property": "Week", "date": {"equals": date_str}},
-        "sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}],
-        "page_size": 100
-    }
-    res = notion_query(NOTION_SUBMISSIONS_DB_ID, q)
-    entries = []
-    for r in res.get("results", []):
-        props = r.get("properties", {})
-        name = ((props.get("Submitter", {}) or {}).get("rich_text") or [{}])[0].get("plain_text","")
-        prob = ((props.get("Problem", {}) or {}).get("rich_text") or [{}])[0].get("plain_text","미지정")
-        when = (props.get("Commit Time", {}) or {}).get("date", {}).get("start")
-        entries.append((prob, name, when))
-    return entries
+    results += [submission_result(*r) for r in run_parallel(
+        lambda task: write_submission(task, commit_dt_kst, repo, branch, sha, pr_url, commits), tasks, workers)]
+    return results
+
+@traced("upsert_submissions")
+async def upsert_submissions_async(changes, commit_dt_kst, repo=None, branch=None, sha=None, pr_url=None, commits=None):
+    """
+    upsert_submissions의 asyncio 버전 (결과 형식 같음)
+    - (Week, Submitter) 그룹마다 조회 → 파일별 쓰기를 코루틴 하나로, 모든 그룹을 동시에
+      (먼저 조회가 끝난 그룹부터 바로 쓰기 시작 → 멤버별 조회/쓰기 대기가 한 단계로 겹침)
+    - 호출은 aio.call로 같은 동기 클라이언트/토큰 버킷을 거침
+    """
+    groups = group_changes(changes)
+
+    async def run_group(key):
+        date_str, name = key
+        try:
+            index = await aio.call(fetch_submission_index, name, date_str)
+        except Exception as e:
+            return [(change, None, "query", e) for change in groups[key].values()]
+        tasks = [(change, index.get(file_path)) for file_path, change in groups[key].items()]
+        return [submission_result(*r) for r in await aio.gather_settled(
+            lambda task: aio.call(write_submission, task, commit_dt_kst, repo, branch, sha, pr_url, commits), tasks)]
+
+    return [r for rows in await asyncio.gather(*map(run_group, groups)) for r in rows]
+
+PROBLEM_PAIRS_PER_QUERY = 50   # Notion 복합 필터 조건 수 제한(100) 대비: 쌍당 조건 2개
+
+def problem_filters(pairs):
+    """중복 제거한 (submitter, date) 쌍을 PROBLEM_PAIRS_PER_QUERY개씩 OR 필터로"""
+    pairs = sorted(set(pairs))
+    for i in range(0, len(pairs), PROBLEM_PAIRS_PER_QUERY):
+        yield {
+            "or": [
+                {"and": [
+                    {"property": "Submitter", "rich_text": {"contains": name}},
+                    {"property": "Week", "date": {"equals": date_str}}
+                ]}
+                for name, date_str in pairs[i:i + PROBLEM_PAIRS_PER_QUERY]
+            ]
+        }
+
+@traced("mark_problems_done")
+def mark_problems_done(pairs) -> List[str]:
+    """
+    문제 DB 정리: (submitter, date) 쌍마다 'Submitter contains name & Week equals date'인 카드를 Done으로
+    - 중복 쌍 제거 후 OR 필터 한 번으로 모든 쌍을 조회
+    - Status가 이미 Done인 카드는 건너뛰고 바뀌는 카드만 PATCH (병렬)
+    return: 업데이트한 page_id 목록
+    """
+    decode = get_decoder(PROBLEMS, ["Status"])
+    todo = {}
+    for flt in problem_filters(pairs):
+        for rec in decode.decode(get_client().iter_query(NOTION_DATABASE_ID_PROB, filter=flt, props=decode.props)):
+            if rec.status != "Done":
+                todo[rec.id] = True
+
+    updated = []
+    done = {"Status": {"select": {"name": "Done"}}}
+    for pid, _, err in run_parallel(lambda pid: get_client().update(pid, done), todo, NOTION_WORKERS):
+        if err is not None:
+            print("[WARN] mark_problems_done:", pid, repr(err))
+        else:
+            updated.append(pid)
+    return updated
+
+ENTRY_PROPS = ["Submitter", "Problem", "Commit Time", "File Path"]
+
+@traced("query_today_entries")
+def query_today_entries(date_str, since=None) -> Dict[str, List[str]]:
+    """
+    Week가 date_str인 제출 → {File Path: [Problem, Submitter, Commit Time]} (수정 시각 오름차순)
+    - since(ISO)를 주면 그 이후 수정된 페이지만 조회 (롤업 증분 갱신)
+    - 로컬 미러가 있으면 증분 동기화 1회 후 로컬 인덱스로 (미러 자체가 증분이라 since는 무시)
+    """
+    mirror = get_mirror()
+    if mirror is not None:
+        mirror.sync(NOTION_SUBMISSIONS_DB_ID, SUBMISSIONS)
+        return {r["file_path"] or r["page_id"]: [r["problem"] or "미지정", r["submitter"], r["commit_time"]]
+                for r in mirror.pages_on(NOTION_SUBMISSIONS_DB_ID, date_str)}
+
+    flt = {"property": "Week", "date": {"equals": date_str}}
+    if since:
+        flt = {"and": [flt, {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": since}}]}
+    decode = get_decoder(SUBMISSIONS, ENTRY_PROPS)
+    pages = get_client().iter_query(NOTION_SUBMISSIONS_DB_ID, filter=flt, props=decode.props,
+                                    sorts=[{"timestamp": "last_edited_time", "direction": "ascending"}])
+    return {rec.file_path or rec.id: [rec.problem or "미지정", rec.submitter, rec.commit_time] for rec in decode.decode(pages)}
+
+def query_today_submissions_kst(today_kst: datetime) -> List[Tuple[str,str,str]]:
+    """오늘 제출 전체 → [(Problem, Submitter, Commit Time), ...]"""
+    return [tuple(e) for e in query_today_entries(today_kst.strftime("%Y-%m-%d")).values()]
 
 def build_daily_message(entries: List[Tuple[str,str,str]], today_kst: datetime) -> str:
     groups: Dict[str, List[Tuple[str,str]]] = {}
@@ -190,12 +343,176 @@ def build_daily_message(entries: List[Tuple[str,str,str]], today_kst: datetime)
         msg_lines.append(f"↳ 오늘자 제출 로그: {NOTION_DB_URL}")
     return "\n".join(msg_lines).strip()
 
+# ─────────────────────────────────────────────────────
+# Daily rollup (하루 메시지 하나를 수정)
+# ─────────────────────────────────────────────────────
+# STATE_DIR/daily_rollup.json
+#   {"date": 오늘(KST), "webhook": 웹훅 지문, "message_id": 오늘 메시지 id, "fp": 마지막 본문 지문,
+#    "since": 다음 증분 조회 기준 시각, "entries": {File Path: [Problem, Submitter, Commit Time]}}
+# - 오늘 첫 실행(상태 없음)만 오늘 제출 전체를 조회하고, 이후에는 since 이후 수정된 제출만 조회해 entries에 합침
+#   (Notion last_edited_time은 분 단위로 잘리므로 since는 조회 시작 시각에서 ROLLUP_OVERLAP만큼 앞당김)
+# - 같은 프로세스에서 방금 업서트한 결과도 바로 합침 (조회에 아직 안 보일 수 있음)
+# - 보관/삭제된 제출 페이지는 증분 조회에 나오지 않으므로 그날 메시지에는 남음
+# - Actions에서는 업서트 잡(git-to-notion.yml, push/PR ref마다)이 아니라 daily-rollup.yml(workflow_run,
+#   기본 브랜치에서 실행)이 --rollup-only로 갱신 → 상태 캐시가 한 곳이라 PR/main 실행이 같은 메시지를 수정
+ROLLUP_OVERLAP = timedelta(minutes=2)
+
+def load_rollup(date_str):
+    st = load_state(ROLLUP_STATE) or {}
+    if st.get("date") != date_str or st.get("webhook") != fingerprint(DISCORD_WEBHOOK_URL):
+        return None
+    return dict(new_rollup(date_str), **st)   # 예전 형식(since/entries 없음)이면 전체 조회부터
+
+def new_rollup(date_str):
+    return {"date": date_str, "webhook": fingerprint(DISCORD_WEBHOOK_URL), "message_id": None, "fp": None,
+            "since": None, "entries": {}}
+
+def apply_results(st, results, commits=None, commit_dt_kst=None):
+    """성공한 업서트 중 오늘 날짜 폴더인 것만 롤업 항목에 반영 (방금 쓴 페이지가 조회에 아직 안 보일 수 있음)"""
+    for (name, date_str, problem, file_path), _, _, err in results:
+        if err is None and date_str == st["date"]:
+            dt = (commits or {}).get(file_path, (commit_dt_kst, None))[0]
+            st["entries"][file_path] = [problem, name, iso(dt) if dt else None]
+
+def rollup_content(st):
+    """보낼 본문. 이전과 같으면 None"""
+    if not st["entries"]:
+        return None
+    today_kst = datetime.strptime(st["date"], "%Y-%m-%d")
+    content = build_daily_message([tuple(e) for e in st["entries"].values()], today_kst)
+    if st["message_id"] and st["fp"] == fingerprint(content):
+        return None
+    return content
+
+@traced("update_rollup")
+def update_rollup(results=(), commits=None, commit_dt_kst=None):
+    """오늘 롤업 메시지 갱신: 있으면 PATCH, 없으면(또는 지워졌으면) 새로 보내고 id 저장"""
+    date_str = datetime.now(KST).strftime("%Y-%m-%d")
+    st = load_rollup(date_str) or new_rollup(date_str)
+    started = datetime.now(timezone.utc)
+    st["entries"].update(query_today_entries(date_str, since=st["since"]))
+    st["since"] = iso(started - ROLLUP_OVERLAP)
+    apply_results(st, results, commits, commit_dt_kst)
+    content = rollup_content(st)
+    if content is not None:
+        sender = get_discord_sender()
+        payload = discord_payload(content)
+        if st["message_id"]:
+            import requests
+            try:
+                sender.request("PATCH", f"{DISCORD_WEBHOOK_URL}/messages/{st['message_id']}", payload)
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code != 404:
+                    raise
+                st["message_id"] = None   # 메시지가 지워졌으면 새로 보냄
+        if not st["message_id"]:
+            st["message_id"] = sender.post(DISCORD_WEBHOOK_URL, payload, wait=True)["id"]
+        st["fp"] = fingerprint(content)
+        print(f"[DISCORD] daily rollup {st['message_id']} ({len(st['entries'])} entries)")
+    else:
+        print("[INFO] Daily rollup unchanged." if st["entries"] else "[INFO] No entries for today.")
+    save_state(ROLLUP_STATE, st)   # 바뀐 게 없어도 since/entries는 저장 (다음 조회를 증분으로)
+
+# ─────────────────────────────────────────────────────
+# Backfill (local git history)
+# ─────────────────────────────────────────────────────
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+def git_log_args(spec: str) -> List[str]:
+    """
+    'SINCE..UNTIL' → git log 인자
+    - 양쪽이 날짜(YYYY-MM-DD, 비워도 됨)면 --since/--until (KST 기준 하루 단위)
+    - 아니면 리비전 범위 그대로 (예: v1..main, abc123..HEAD)
+    """
+    since, sep, until = spec.partition("..")
+    if not sep:
+        raise ValueError(f"--backfill expects SINCE..UNTIL, got {spec!r}")
+    if all(not x or DATE_RE.match(x) for x in (since, until)):
+        args = []
+        if since:
+            args.append(f"--since={since}T00:00:00+09:00")
+        if until:
+            args.append(f"--until={until}T23:59:59+09:00")
+        return args
+    return [spec]
+
+def iter_git_history(spec: str, pathspec: str = ":/study/"):
+    """
+    로컬 git 이력을 오래된 커밋부터 스트리밍 → (path, commit_dt_kst, sha)
+    - git log -z 출력을 청크 단위로 NUL마다 잘라 읽음 (iter_nul_paths, 공백/줄바꿈이 든 경로도 그대로)
+      토큰은 "\x01<sha> <커밋 시각>" 머리말 또는 경로 (머리말 바로 다음 경로 앞에는 "\n"이 붙음)
+    - pathspec ":/study/"는 저장소 루트 기준이라 하위 폴더에서 실행해도 같은 결과 (경로도 루트 기준으로 나옴)
+    """
+    cmd = ["git", "log", "-z", "--reverse", "--no-renames", "--diff-filter=AM", "--name-only",
+           "--format=%x01%H %cI", *git_log_args(spec), "--", pathspec]
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE) as proc:
+        sha, dt = None, None
+        for token in iter_nul_paths(proc.stdout):
+            if token.startswith("\n"):
+                token = token[1:]
+            if token.startswith("\x01"):
+                sha, iso_time = token[1:].split(" ", 1)
+                dt = to_kst(datetime.fromisoformat(iso_time))
+            elif token and sha:
+                yield token, dt, sha
+    if proc.returncode:
+        raise RuntimeError(f"git log failed ({proc.returncode}): {' '.join(cmd)}")
+
+def collect_backfill(spec: str):
+    """
+    이력 전체를 파일 단위로 중복 제거: 경로마다 마지막으로 건드린 커밋의 시각/해시만 남김
+    (라이브 모드가 푸시마다 Commit Time을 갱신하는 것과 같은 결과)
+    return: (changes, {path: (commit_dt_kst, sha)})
+    """
+    commits: Dict[str, Tuple[datetime, str]] = {}
+    for path, dt, sha in iter_git_history(spec):
+        if PATH_RE.match(path):
+            commits[path] = (dt, sha)
+    return parse_changed_paths(list(commits)), commits
+
+def report_results(results) -> int:
+    """업서트 결과 출력, 실패 건수 반환"""
+    failed = 0
+    for (name, date_str, problem, file_path), pid, op, err in results:
+        if err is not None:
+            failed += 1
+            print(f"[NOTION][SUBMISSION][ERROR] {op}: {name} {date_str} {problem} {file_path} -> {err!r}")
+            continue
+        print(f"[NOTION][SUBMISSION] {op}: {name} {date_str} {problem} {file_path} -> {pid}")
+    print(f"[SUMMARY] submissions ok={len(results) - failed} failed={failed}")
+    return failed
+
+def reconcile_problems(results):
+    pairs = {(name, date_str) for (name, date_str, _, _), _, _, err in results if err is None}
+    try:
+        done = mark_problems_done(pairs)
+        print(f"[NOTION][PROBLEM] pairs={len(pairs)} marked Done={len(done)}")
+    except Exception as e:
+        print("[WARN] mark_problems_done:", repr(e))
+
+def run_backfill(spec: str, repo=None, branch=None):
+    """이력 재생: 배치 업서트 + 문제 DB 정리 (Discord 롤업은 보내지 않음)"""
+    changes, commits = collect_backfill(spec)
+    if not changes:
+        print("[INFO] No study/ submissions in history range.")
+        return
+    print(f"[BACKFILL] {len(changes)} file(s) from {len({c[1] for c in changes})} day(s)")
+    results = upsert_submissions(changes, commit_dt_kst=None, repo=repo, branch=branch, commits=commits)
+    failed = report_results(results)
+    reconcile_problems(results)
+    if failed:
+        raise SystemExit(f"{failed} submission upsert(s) failed")
+
 # ─────────────────────────────────────────────────────
 # Main
 # ─────────────────────────────────────────────────────
-def main():
+def parse_args():
     ap = argparse.ArgumentParser()
     ap.add_argument("--paths", default="")
+    ap.add_argument("--paths-file", default="", metavar="FILE",
+                    help="NUL 구분 변경 경로 파일 (git diff -z --name-only 출력), '-'면 stdin")
+    ap.add_argument("--diff", default="", metavar="REVS",
+                    help="변경 경로를 직접 계산: git diff -z --name-only REVS -- study/ (예: origin/main...HEAD)")
     ap.add_argument("--event", default="")
     ap.add_argument("--action", default="")
     ap.add_argument("--is_merged", default="false")
@@ -204,45 +521,92 @@ def main():
     ap.add_argument("--ref", default=os.environ.get("GITHUB_REF",""))
     ap.add_argument("--sha", default=os.environ.get("GITHUB_SHA",""))
     ap.add_argument("--pr_url", default=os.environ.get("GITHUB_SERVER_URL","") + "/" + os.environ.get("GITHUB_REPOSITORY",""))
-    args = ap.parse_args()
+    ap.add_argument("--backfill", default="", metavar="SINCE..UNTIL",
+                    help="로컬 git 이력 재생 (날짜 YYYY-MM-DD..YYYY-MM-DD 또는 리비전 범위)")
+    ap.add_argument("--async", dest="use_async", action="store_true",
+                    help="asyncio 진입점: 멤버별 조회/쓰기와 문제 정리/롤업을 동시에 (ENV ASYNC_IO=1과 같음)")
+    rollup = ap.add_mutually_exclusive_group()
+    rollup.add_argument("--skip-rollup", action="store_true",
+                        help="업서트만 하고 오늘 롤업 메시지는 건드리지 않음 (Actions: 롤업은 daily-rollup.yml이 갱신)")
+    rollup.add_argument("--rollup-only", action="store_true",
+                        help="업서트 없이 Notion에서 오늘 제출을 읽어 롤업 메시지만 갱신")
+    return ap.parse_args()
+
+@traced("git_to_notion.main")
+def main():
+    args = parse_args()
 
-    raw = args.paths.replace("\r"," ").replace("\n"," ").replace(",", " ")
-    paths = [p for p in raw.split(" ") if p]
-    changes = parse_changed_paths(paths)
+    if args.backfill:
+        configure()
+        run_backfill(args.backfill, repo=args.repo, branch=args.ref)
+        return
+
+    if args.rollup_only:
+        configure()
+        post_rollup([])
+        return
+
+    changes = parse_changed_paths(iter_changed_paths(args))
     if not changes:
+        # 설정/네트워크 모듈을 건드리기 전에 종료
         print("[INFO] No study/ submissions detected.")
         return
 
+    configure()
+    pr_url = args.pr_url if "pull" in args.pr_url else None
+    merged = (str(args.is_merged).lower() == "true") or (args.event == "push")
+
+    if args.use_async or ASYNC_IO:
+        failed = asyncio.run(run_sync_async(changes, args.repo, args.ref, args.sha, pr_url, merged, rollup=not args.skip_rollup))
+    else:
+        failed = run_sync(changes, args.repo, args.ref, args.sha, pr_url, merged, rollup=not args.skip_rollup)
+
+    if failed:
+        raise SystemExit(f"{failed} submission upsert(s) failed")
+
+def run_sync(changes, repo=None, branch=None, sha=None, pr_url=None, merged=False, rollup=True) -> int:
     commit_dt_kst = datetime.now(KST)
 
-    for (name, date_str, problem, file_path) in changes:
-        pid, op = upsert_submission(
-            name=name,
-            date_str=date_str,
-            problem=problem,
-            commit_dt_kst=commit_dt_kst,
-            file_path=file_path,
-            repo=args.repo,
-            branch=args.ref,
-            sha=args.sha,
-            pr_url=args.pr_url if "pull" in args.pr_url else None
-        )
-        print(f"[NOTION][SUBMISSION] {op}: {name} {date_str} {problem} {file_path} -> {pid}")
+    results = upsert_submissions(
+        changes,
+        commit_dt_kst=commit_dt_kst,
+        repo=repo,
+        branch=branch,
+        sha=sha,
+        pr_url=pr_url
+    )
+    failed = report_results(results)
+    if merged:
+        reconcile_problems(results)
 
-        merged = (str(args.is_merged).lower() == "true") or (args.event == "push")
-        if merged:
-            try:
-                mark_problem_done_if_match(name, date_str)
-            except Exception as e:
-                print("[WARN] mark_problem_done_if_match:", repr(e))
+    if rollup:
+        post_rollup(results, commit_dt_kst=commit_dt_kst)
+    return failed
 
+async def run_sync_async(changes, repo=None, branch=None, sha=None, pr_url=None, merged=False, rollup=True) -> int:
+    """run_sync의 asyncio 버전: 업서트 후 문제 DB 정리와 롤업(서로 무관)을 동시에"""
+    commit_dt_kst = datetime.now(KST)
+    results = await upsert_submissions_async(changes, commit_dt_kst, repo, branch, sha, pr_url)
+    failed = report_results(results)
+    jobs = [aio.call(post_rollup, results, commit_dt_kst=commit_dt_kst)] if rollup else []
+    if merged:
+        jobs.append(aio.call(reconcile_problems, results))
+    for res in await asyncio.gather(*jobs, return_exceptions=True):   # 둘 다 끝난 뒤 실패를 올림
+        if isinstance(res, BaseException):
+            raise res
+    return failed
+
+def post_rollup(results, commits=None, commit_dt_kst=None):
+    """오늘 제출 현황 전송: 기본은 하루 메시지 하나를 수정, ROLLUP_EDIT=0이면 매번 새 메시지"""
+    if ROLLUP_EDIT:
+        return update_rollup(results, commits, commit_dt_kst)
     today_kst = datetime.now(KST)
     entries = query_today_submissions_kst(today_kst)
     if not entries:
         print("[INFO] No entries for today.")
-        return
-    content = build_daily_message(entries, today_kst)
-    post_discord(DISCORD_WEBHOOK_URL, content=content)
+    else:
+        content = build_daily_message(entries, today_kst)
+        post_discord(DISCORD_WEBHOOK_URL, content=content)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/scripts/members.py
+"""
+스터디 멤버 디렉터리 (모든 스크립트 공용)
+
+config/members.json 형식 (두 가지를 섞어 써도 됨)
+    {
+      "홍길동": "123456789012345678",
+      "Alice":  {"id": "234567890123456789", "folder": "alice", "aliases": ["앨리스", "alice.k"]}
+    }
+- 키: 표시 이름(출석 요약/리마인드에 쓰는 이름, 파일에 적힌 순서 유지)
+- id: Discord 사용자 ID (멘션용, 없어도 됨)
+- folder: study/<folder>/ 폴더 이름 (기본: 키와 같음)
+- aliases: Notion Submitter 등에 다르게 적힐 수 있는 이름들
+
+파일이 없으면 ENV MEMBERS_CSV="A,B,C" 로 이름만 구성
+
+- 이름 정규화(NFC + 앞뒤 공백 제거 + casefold)는 로드 때 한 번만 하고
+  이름/별칭/폴더 → 멤버 조회는 dict 한 번으로 끝남
+- 파싱 결과는 (경로, 파일 mtime) 기준으로 캐시 → 상주 프로세스에서도 파일이 바뀔 때만 다시 읽음
+
+환경변수
+- MEMBERS_MAP_PATH   # (선택) 기본 config/members.json
+- MEMBERS_CSV        # (선택) 파일이 없을 때 멤버 이름 목록
+"""
+
+import json
+import os
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "members.json")
+
+
+def normalize(name: str) -> str:
+    return unicodedata.normalize("NFC", (name or "").strip()).casefold()
+
+
+class Member:
+    __slots__ = ("name", "discord_id", "folder", "aliases")
+
+    def __init__(self, name: str, discord_id: str = "", folder: str = "", aliases=()):
+        self.name = name
+        self.discord_id = discord_id
+        self.folder = folder or name
+        self.aliases = tuple(aliases)
+
+    def __repr__(self):
+        return f"Member({self.name!r})"
+
+
+class MemberDirectory:
+    def __init__(self, members: List[Member]):
+        self.members = members
+        self._index: Dict[str, Member] = {}
+        # 모든 멤버의 표시 이름 → 폴더 → 별칭 순으로 등록 (같은 단계 안에서는 먼저 나온 멤버가 이김)
+        # → 앞 멤버의 별칭이 뒤 멤버의 표시 이름을 가리지 않음
+        for m in members:
+            self._index.setdefault(normalize(m.name), m)
+        for m in members:
+            self._index.setdefault(normalize(m.folder), m)
+        for m in members:
+            for alias in m.aliases:
+                self._index.setdefault(normalize(alias), m)
+
+    @classmethod
+    def from_mapping(cls, raw: dict):
+        members = []
+        for name, v in raw.items():
+            if not name or not name.strip():
+                continue
+            if isinstance(v, dict):
+                members.append(Member(name.strip(), str(v.get("id") or "").strip(), (v.get("folder") or "").strip(),
+                                      [a.strip() for a in v.get("aliases") or [] if a and a.strip()]))
+            else:
+                members.append(Member(name.strip(), str(v or "").strip()))
+        return cls(members)
+
+    @classmethod
+    def from_csv(cls, csv: str):
+        return cls([Member(s.strip()) for s in (csv or "").split(",") if s.strip()])
+
+    @property
+    def names(self) -> List[str]:
+        return [m.name for m in self.members]
+
+    def get(self, name: str) -> Optional[Member]:
+        """이름/별칭/폴더 이름 → Member (없으면 None)"""
+        return self._index.get(normalize(name))
+
+    def canonical(self, name: str) -> str:
+        """표시 이름으로 통일 (모르는 이름은 그대로)"""
+        m = self.get(name)
+        return m.name if m else name
+
+    def discord_id(self, name: str) -> str:
+        m = self.get(name)
+        return m.discord_id if m else ""
+
+    def discord_ids(self, names: Iterable[str]) -> List[str]:
+        """이름 목록 → Discord ID 목록 (없는 이름은 건너뛰고, 중복 제거하며 순서 유지)"""
+        ids, seen = [], set()
+        for n in names:
+            uid = self.discord_id(n)
+            if uid and uid not in seen:
+                seen.add(uid)
+                ids.append(uid)
+        return ids
+
+    def __len__(self):
+        return len(self.members)
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+
+_cache = {}   # path → ((mtime_ns, size), MemberDirectory)
+_cache_lock = threading.Lock()
+
+def get_directory(path: str = None) -> MemberDirectory:
+    """members.json(없으면 MEMBERS_CSV) → MemberDirectory. 파일이 바뀌지 않았으면 캐시 재사용"""
+    path = os.path.realpath(path or os.environ.get("MEMBERS_MAP_PATH") or DEFAULT_PATH)
+    try:
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        stamp = ("csv", os.environ.get("MEMBERS_CSV", ""))
+    with _cache_lock:
+        hit = _cache.get(path)
+        if hit and hit[0] == stamp:
+            return hit[1]
+        if stamp[0] == "csv":
+            directory = MemberDirectory.from_csv(stamp[1])
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                directory = MemberDirectory.from_mapping(json.load(f))
+        _cache[path] = (stamp, directory)
+        return directory
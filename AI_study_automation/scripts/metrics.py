@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/scripts/metrics.py
+"""
+외부 HTTP 호출 계측 (Notion / Discord)
+
+- record(): 클라이언트가 호출 1건(재시도 포함)이 끝날 때마다 기록
+  (서비스, 메서드, 엔드포인트, 상태코드, 지연, 재시도 수, 스로틀 대기, 요청/응답 바이트)
+- @traced("이름"): 어떤 함수가 호출을 일으켰는지 라벨링 (스레드 풀/제너레이터에서도 유지)
+- 프로세스 종료 시 요약 출력
+  - stdout: "[METRICS] {...}" JSON 한 줄
+  - $GITHUB_STEP_SUMMARY 가 있으면 마크다운 표를 덧붙임
+
+환경변수
+- METRICS   # (선택) "0"이면 계측/요약 끔
+"""
+
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+
+_label = contextvars.ContextVar("metrics_label", default="(main)")
+_lock = threading.Lock()
+_calls = []
+_registered = False
+
+
+def enabled() -> bool:
+    return os.environ.get("METRICS", "1") != "0"
+
+
+def current_label() -> str:
+    return _label.get()
+
+
+def traced(name: str):
+    """이 함수 안에서 일어난 HTTP 호출을 name으로 집계 (제너레이터는 next() 구간만)"""
+    def deco(fn):
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def gen_wrapper(*args, **kwargs):
+                it = fn(*args, **kwargs)
+                while True:
+                    token = _label.set(name)
+                    try:
+                        item = next(it)
+                    except StopIteration:
+                        return
+                    finally:
+                        _label.reset(token)
+                    yield item
+            return gen_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            token = _label.set(name)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _label.reset(token)
+        return wrapper
+    return deco
+
+
+def record(service, method, endpoint, status, latency, retries=0, throttle_wait=0.0, req_bytes=0, resp_bytes=0):
+    global _registered
+    if not enabled():
+        return
+    with _lock:
+        _calls.append({
+            "service": service, "method": method, "endpoint": endpoint, "status": status,
+            "function": _label.get(), "latency": latency, "retries": retries,
+            "throttle_wait": throttle_wait, "req_bytes": req_bytes, "resp_bytes": resp_bytes,
+        })
+        if not _registered:
+            atexit.register(emit_summary)
+            _registered = True
+
+
+def _pct(sorted_vals, q):
+    if not sorted_vals:
+        return 0.0
+    k = min(len(sorted_vals) - 1, max(0, int(round(q * (len(sorted_vals) - 1)))))
+    return sorted_vals[k]
+
+
+def _group(calls, key):
+    groups = {}
+    for c in calls:
+        groups.setdefault(key(c), []).append(c)
+    out = []
+    for k, items in sorted(groups.items()):
+        lat = sorted(c["latency"] for c in items)
+        out.append({
+            "key": k,
+            "calls": len(items),
+            "errors": sum(1 for c in items if not c["status"] or c["status"] >= 400),
+            "retries": sum(c["retries"] for c in items),
+            "throttle_wait_s": round(sum(c["throttle_wait"] for c in items), 3),
+            "p50_ms": round(_pct(lat, 0.50) * 1000, 1),
+            "p95_ms": round(_pct(lat, 0.95) * 1000, 1),
+            "req_bytes": sum(c["req_bytes"] for c in items),
+            "resp_bytes": sum(c["resp_bytes"] for c in items),
+        })
+    return out
+
+
+def summary() -> dict:
+    with _lock:
+        calls = list(_calls)
+    return {
+        "total_calls": len(calls),
+        "by_function": _group(calls, lambda c: f'{c["function"]} [{c["service"]}]'),
+        "by_endpoint": _group(calls, lambda c: f'{c["service"]} {c["method"]} {c["endpoint"]}'),
+    }
+
+
+def _markdown(s: dict) -> str:
+    cols = ["calls", "errors", "retries", "throttle_wait_s", "p50_ms", "p95_ms", "req_bytes", "resp_bytes"]
+    lines = []
+    for title, rows in (("function", s["by_function"]), ("endpoint", s["by_endpoint"])):
+        lines.append(f"| {title} | " + " | ".join(cols) + " |")
+        lines.append("|:--|" + "--:|" * len(cols))
+        for r in rows:
+            lines.append(f"| `{r['key']}` | " + " | ".join(str(r[c]) for c in cols) + " |")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def emit_summary():
+    s = summary()
+    if not s["total_calls"]:
+        return
+    print("[METRICS]", json.dumps(s, ensure_ascii=False))
+    step_summary = os.environ.get("GITHUB_STEP_SUMMARY")
+    if step_summary:
+        try:
+            with open(step_summary, "a", encoding="utf-8") as f:
+                f.write(f"### HTTP metrics ({s['total_calls']} calls)\n\n" + _markdown(s) + "\n")
+        except OSError as e:
+            print("[METRICS][WARN]", repr(e))
+
+
+def reset():
+    with _lock:
+        _calls.clear()
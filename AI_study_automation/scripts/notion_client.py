@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/scripts/notion_client.py
+"""
+공용 Notion API 클라이언트
+
+- keep-alive requests.Session 하나를 프로세스 전체에서 공유(커넥션 풀 재사용)
+- 풀 크기/타임아웃은 ENV 또는 생성자 인자로 조정
+- query / create / update 만 제공 (스크립트들이 쓰는 범위)
+- query/iter_query(props=[속성 이름...])는 filter_properties로 그 속성만 받아옴
+  (DB별 속성 id는 GET databases/{id}로 한 번 조회해 STATE_DIR/notion_property_ids.json에 보관)
+- 모든 호출은 프로세스 공용 토큰 버킷(기본 3회/초)을 거치고,
+  429/5xx/연결 오류는 Retry-After를 존중하는 지수 백오프로 재시도
+
+환경변수
+- NOTION_API_KEY
+- NOTION_POOL_SIZE     # (선택) 커넥션 풀 크기, 기본 8
+- NOTION_TIMEOUT       # (선택) 기본 타임아웃(초), 기본 30
+- NOTION_RATE_LIMIT    # (선택) 초당 요청 수, 기본 3
+- NOTION_MAX_RETRIES   # (선택) 재시도 횟수, 기본 5
+- NOTION_API_BASE      # (선택) API 주소, 기본 https://api.notion.com/v1 (벤치마크용 가짜 서버 등)
+- NOTION_PROJECTION    # (선택) "0"이면 props를 무시하고 항상 모든 속성을 받음, 기본 "1"
+"""
+
+import os
+import time
+import threading
+from urllib.parse import unquote
+
+try:
+    from AI_study_automation.scripts.utils import get_env, load_state, save_state
+    from AI_study_automation.scripts.ratelimit import TokenBucket, backoff_delay, parse_retry_after
+    from AI_study_automation.scripts import metrics
+except Exception:
+    from scripts.utils import get_env, load_state, save_state
+    from scripts.ratelimit import TokenBucket, backoff_delay, parse_retry_after
+    from scripts import metrics
+
+NOTION_API_BASE = "https://api.notion.com/v1"
+NOTION_VERSION  = "2022-06-28"
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# 계측용 엔드포인트 이름 (id 제거)
+ENDPOINTS = {"QUERY": "databases/{id}/query", "CREATE": "pages", "UPDATE": "pages/{id}", "DATABASE": "databases/{id}"}
+
+
+class PropertyIds:
+    """
+    DB별 속성 이름 → 속성 id 캐시 (filter_properties용)
+    - 메모리 + 상태 파일. 속성 id는 이름을 바꿔도 그대로라 오래 보관해도 안전
+    - 모르는 이름이 나오면(속성 추가/이름 변경) 프로세스당 한 번만 다시 조회
+    """
+    STATE_NAME = "notion_property_ids"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = None    # db_id → {name: id}
+        self._fresh = set()  # 이번 프로세스에서 조회한 db_id
+
+    def _load(self) -> dict:
+        if self._data is None:
+            self._data = load_state(self.STATE_NAME, {}) or {}
+        return self._data
+
+    def ids_for(self, dbid: str, names):
+        """캐시로 해결되면 id 목록(DB에 없는 이름은 뺌), 다시 조회해야 하면 None"""
+        with self._lock:
+            known = self._load().get(dbid)
+            if known is None or (dbid not in self._fresh and any(n not in known for n in names)):
+                return None
+            return [known[n] for n in names if n in known]
+
+    def update(self, dbid: str, database: dict):
+        """GET databases/{id} 응답 반영. id는 쿼리 문자열에 넣을 때 다시 인코딩되므로 디코딩해 보관"""
+        mapping = {name: unquote(p["id"]) for name, p in (database.get("properties") or {}).items()}
+        with self._lock:
+            self._load()[dbid] = mapping
+            self._fresh.add(dbid)
+            save_state(self.STATE_NAME, self._data)
+
+
+class NotionClient:
+    def __init__(self, api_key: str, pool_size: int = 8, timeout: float = 30, base_url: str = NOTION_API_BASE,
+                 limiter: TokenBucket = None, max_retries: int = 5, projection: bool = True):
+        import requests   # 첫 클라이언트를 만들 때만 import (CLI 시작 시간)
+        from requests.adapters import HTTPAdapter
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.limiter = limiter or TokenBucket(3)
+        self.max_retries = max_retries
+        self.projection = projection
+        self.prop_ids = PropertyIds()
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Notion-Version": NOTION_VERSION,
+            "Content-Type": "application/json",
+        })
+        # 호스트가 api.notion.com 하나뿐이므로 pool_connections=1, 동시 연결 수만 pool_size
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _request(self, method: str, path: str, tag: str, payload=None, timeout=None, idempotent=True, params=None) -> dict:
+        """
+        idempotent=False(페이지 생성)인 경우, 서버에 반영됐을 수도 있는 실패(5xx/응답 대기 중 끊김)는
+        중복 생성을 막기 위해 재시도하지 않고 429/연결 실패만 재시도
+        """
+        import requests
+        url = f"{self.base_url}/{path}"
+        retryable_status = RETRY_STATUS if idempotent else {429}
+        retryable_exc = (requests.ConnectionError, requests.Timeout) if idempotent else (requests.ConnectTimeout,)
+        attempt, waited, r = 0, 0.0, None
+        started = time.perf_counter()
+        try:
+            while True:
+                waited += self.limiter.acquire()
+                try:
+                    r = self.session.request(method, url, json=payload, params=params, timeout=timeout or self.timeout)
+                except retryable_exc as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = backoff_delay(attempt)
+                    print(f"[NOTION][{tag}][RETRY] {e.__class__.__name__}, {delay:.1f}s 후 재시도")
+                    time.sleep(delay)
+                    waited += delay
+                else:
+                    if r.status_code not in retryable_status or attempt >= self.max_retries:
+                        break
+                    retry_after = parse_retry_after(r.headers.get("Retry-After"))
+                    delay = backoff_delay(attempt, retry_after=retry_after)
+                    print(f"[NOTION][{tag}][RETRY] {r.status_code}, {delay:.1f}s 후 재시도")
+                    if r.status_code == 429:
+                        # 다른 스레드도 같은 한도를 쓰므로 버킷 전체를 멈춤 (다음 acquire에서 대기)
+                        self.limiter.pause(delay)
+                    else:
+                        time.sleep(delay)
+                        waited += delay
+                attempt += 1
+        finally:
+            metrics.record(
+                "notion", method, ENDPOINTS.get(tag, path),
+                r.status_code if r is not None else None,
+                time.perf_counter() - started, retries=attempt, throttle_wait=waited,
+                req_bytes=len(r.request.body or b"") if r is not None else 0,
+                resp_bytes=len(r.content) if r is not None else 0,
+            )
+
+        if r.status_code >= 400:
+            print(f"[NOTION][{tag}][ERROR]", r.status_code, r.text[:300])
+        r.raise_for_status()
+        return r.json()
+
+    def property_ids(self, dbid: str, names) -> list:
+        """속성 이름들 → filter_properties용 id 목록 (캐시에 없으면 GET databases/{id} 한 번)"""
+        ids = self.prop_ids.ids_for(dbid, names)
+        if ids is None:
+            try:
+                database = self._request("GET", f"databases/{dbid}", "DATABASE")
+            except Exception as e:
+                print("[NOTION][DATABASE][WARN] property ids unavailable, fetching all properties:", repr(e))
+                database = {}
+            self.prop_ids.update(dbid, database)
+            ids = self.prop_ids.ids_for(dbid, names)
+        return ids
+
+    def query(self, dbid: str, payload: dict, timeout=None, props=None) -> dict:
+        """props(속성 이름 목록)를 주면 그 속성만 받음 (알 수 없으면 전체)"""
+        params = None
+        if props and self.projection:
+            ids = self.property_ids(dbid, props)
+            if ids:
+                params = {"filter_properties": ids}
+        return self._request("POST", f"databases/{dbid}/query", "QUERY", payload, timeout, params=params)
+
+    def iter_query(self, dbid: str, filter=None, sorts=None, page_size: int = 100, timeout=None, props=None):
+        """
+        has_more/next_cursor를 따라가며 결과 페이지를 하나씩 yield
+        - 다음 커서는 소비자가 이전 묶음을 다 읽었을 때만 요청(lazy)
+        - page_size는 Notion 상한(100)으로 잘림
+        - props: query()와 같음 (필요한 속성만)
+        """
+        payload = {"page_size": min(int(page_size), 100)}
+        if filter:
+            payload["filter"] = filter
+        if sorts:
+            payload["sorts"] = sorts
+        while True:
+            res = self.query(dbid, payload, timeout, props)
+            yield from res.get("results", [])
+            cursor = res.get("next_cursor")
+            if not res.get("has_more") or not cursor:
+                return
+            payload["start_cursor"] = cursor
+
+    def create(self, dbid: str, props: dict, timeout=None) -> str:
+        payload = {"parent": {"database_id": dbid}, "properties": props}
+        return self._request("POST", "pages", "CREATE", payload, timeout, idempotent=False).get("id")
+
+    def update(self, page_id: str, props: dict, timeout=None) -> dict:
+        return self._request("PATCH", f"pages/{page_id}", "UPDATE", {"properties": props}, timeout)
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client() -> NotionClient:
+    """프로세스 공용 클라이언트 (최초 호출 시 생성)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = NotionClient(
+                    get_env("NOTION_API_KEY"),
+                    pool_size=int(os.environ.get("NOTION_POOL_SIZE", "8")),
+                    timeout=float(os.environ.get("NOTION_TIMEOUT", "30")),
+                    limiter=TokenBucket(float(os.environ.get("NOTION_RATE_LIMIT", "3"))),
+                    max_retries=int(os.environ.get("NOTION_MAX_RETRIES", "5")),
+                    base_url=os.environ.get("NOTION_API_BASE", NOTION_API_BASE),
+                    projection=os.environ.get("NOTION_PROJECTION", "1") != "0",
+                )
+    return _client
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/scripts/notion_mirror.py
+"""
+Notion DB 로컬 미러 (SQLite, read-through)
+
+- 제출 로그 DB / 문제 DB 페이지를 필요한 속성만 뽑아 로컬 테이블에 보관
+- sync(dbid): 마지막 동기화 이후 last_edited_time 이 바뀐 페이지만 조회해 반영(증분)
+- 조회(오늘 제출자, 이번 주 카드 등)는 Week 날짜 범위로 로컬 인덱스(db_id, week)에서 처리
+- 삭제/보관된 페이지는 증분 조회에 나오지 않으므로 MIRROR_FULL_SYNC_HOURS마다 전체 재동기화
+- 미러가 없거나 오래되면 첫 sync가 DB 전체를 받으므로, 상태가 이어지는 상주 프로세스(daemon/receiver)용
+  → 하루/주 단위로 한 번 도는 Actions 잡은 NOTION_MIRROR=0으로 날짜 필터 조회 한 번만 함
+
+환경변수
+- NOTION_MIRROR              # (선택) "0"이면 미러를 쓰지 않고 매번 Notion을 직접 조회, 기본 "1"
+- NOTION_MIRROR_PATH         # (선택) SQLite 파일 경로, 기본 STATE_DIR/notion_mirror.sqlite3
+- MIRROR_FULL_SYNC_HOURS     # (선택) 전체 재동기화 주기(시간), 기본 24
+"""
+
+import functools
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+
+try:
+    from AI_study_automation.scripts.utils import get_env, state_dir
+    from AI_study_automation.scripts.notion_client import get_client
+    from AI_study_automation.scripts.metrics import traced
+    from AI_study_automation.scripts.schema import get_decoder, load_schema
+except Exception:
+    from scripts.utils import get_env, state_dir
+    from scripts.notion_client import get_client
+    from scripts.metrics import traced
+    from scripts.schema import get_decoder, load_schema
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    page_id          TEXT PRIMARY KEY,
+    db_id            TEXT NOT NULL,
+    last_edited_time TEXT,
+    name             TEXT,
+    week             TEXT,
+    submitter        TEXT,
+    problem          TEXT,
+    file_path        TEXT,
+    commit_time      TEXT,
+    status           TEXT,
+    next_submitters  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_pages_week ON pages(db_id, week);
+DROP INDEX IF EXISTS idx_pages_submitter;   -- 이 인덱스를 쓰는 조회가 없음 (예전 미러 파일 정리)
+DROP INDEX IF EXISTS idx_pages_file_path;
+CREATE TABLE IF NOT EXISTS sync_state (
+    db_id          TEXT PRIMARY KEY,
+    since          TEXT,
+    full_synced_at TEXT
+);
+"""
+
+
+# pages 테이블 컬럼 순서 (문제 DB / 제출 로그 DB 속성의 합집합, 타입은 config/schema.md)
+MIRROR_PROPS = ["Name", "Week", "Submitter", "Problem", "File Path", "Commit Time", "Status", "Next Submitters"]
+
+
+@functools.lru_cache(maxsize=None)
+def _columns(db: str):
+    """
+    DB(schema.md 이름) → (디코더, 행 만들기)
+    그 DB에 있는 속성만 조회/디코딩하고 없는 컬럼은 NULL (filter_properties id 캐시도 그대로 맞음)
+    """
+    props = [p for p in MIRROR_PROPS if p in load_schema()[db]]
+    decode = get_decoder(db, props)
+    slots = [props.index(p) + 2 if p in props else None for p in MIRROR_PROPS]   # 레코드 안 위치(id, 수정 시각 다음)
+
+    def row(dbid, rec):
+        """디코딩한 레코드 → pages 행 (page_id, db_id, last_edited_time, MIRROR_PROPS...)"""
+        return (rec.id, dbid, rec.last_edited_time, *(rec[i] if i is not None else None for i in slots))
+    return decode, row
+
+
+class NotionMirror:
+    def __init__(self, path: str, client=None, full_sync_hours: float = 24):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.client = client or get_client()
+        self.full_sync_hours = full_sync_hours
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    @traced("NotionMirror.sync")
+    def sync(self, dbid: str, db: str) -> int:
+        """증분 동기화. db는 schema.md의 DB 이름(PROBLEMS/SUBMISSIONS). 반영한 페이지 수를 반환"""
+        decode, row = _columns(db)
+        with self._lock:
+            st = self.db.execute("SELECT since, full_synced_at FROM sync_state WHERE db_id=?", (dbid,)).fetchone()
+            now = datetime.now(timezone.utc)
+            full = (
+                st is None or not st["full_synced_at"]
+                or now - datetime.fromisoformat(st["full_synced_at"]) > timedelta(hours=self.full_sync_hours)
+            )
+            flt = None
+            if not full and st["since"]:
+                flt = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": st["since"]}}
+
+            since = None if full else st["since"]
+            rows = []
+            pages = self.client.iter_query(dbid, filter=flt, sorts=[{"timestamp": "last_edited_time", "direction": "ascending"}],
+                                           props=decode.props)
+            for rec in decode.decode(pages):
+                rows.append(row(dbid, rec))
+                edited = rec.last_edited_time
+                if edited and (since is None or edited > since):
+                    since = edited
+
+            with self.db:
+                if full:
+                    self.db.execute("DELETE FROM pages WHERE db_id=?", (dbid,))
+                self.db.executemany("INSERT OR REPLACE INTO pages VALUES (?,?,?,?,?,?,?,?,?,?,?)", rows)
+                self.db.execute(
+                    "INSERT INTO sync_state(db_id, since, full_synced_at) VALUES (?,?,?) "
+                    "ON CONFLICT(db_id) DO UPDATE SET since=excluded.since, "
+                    "full_synced_at=COALESCE(excluded.full_synced_at, sync_state.full_synced_at)",
+                    (dbid, since, now.isoformat() if full else None),
+                )
+            return len(rows)
+
+    def pages_on(self, dbid: str, date_str: str, order_by: str = "last_edited_time"):
+        """Week 날짜가 date_str(YYYY-MM-DD)인 페이지"""
+        assert order_by in ("last_edited_time", "commit_time")
+        return self._pages_between(dbid, date_str, _next_day(date_str), order_by)
+
+    def pages_between(self, dbid: str, start_date: str, end_date: str):
+        """start_date <= Week 날짜 < end_date (YYYY-MM-DD)"""
+        return self._pages_between(dbid, start_date, end_date, "week")
+
+    def _pages_between(self, dbid: str, start_date: str, end_date: str, order_by: str):
+        # week는 "YYYY-MM-DD" 또는 "YYYY-MM-DDT..." → 문자열 범위(끝은 다음 날 0시 미만)로 비교해야
+        # idx_pages_week(db_id, week)를 범위 검색으로 씀 (substr()로 감싸면 db_id 접두어까지만 씀)
+        return self.db.execute(
+            f"SELECT * FROM pages WHERE db_id=? AND week>=? AND week<? ORDER BY {order_by}",
+            (dbid, start_date, end_date),
+        ).fetchall()
+
+    def close(self):
+        self.db.close()
+
+
+def _next_day(date_str: str) -> str:
+    return (datetime.strptime(date_str, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+_mirror = None
+_mirror_lock = threading.Lock()
+
+def get_mirror():
+    """프로세스 공용 미러. NOTION_MIRROR=0이면 None (호출부는 Notion 직접 조회로 대체)"""
+    global _mirror
+    if get_env("NOTION_MIRROR", "1") == "0":
+        return None
+    if _mirror is None:
+        with _mirror_lock:
+            if _mirror is None:
+                _mirror = NotionMirror(
+                    get_env("NOTION_MIRROR_PATH", os.path.join(state_dir(), "notion_mirror.sqlite3")),
+                    full_sync_hours=float(get_env("MIRROR_FULL_SYNC_HOURS", "24")),
+                )
+    return _mirror
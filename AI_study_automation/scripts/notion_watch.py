@@ -6,39 +6,60 @@ Notion '문제 제출' DB 변경을 모니터링해 Discord로 알림 전송
 - NOTION_API_KEY
 - NOTION_DATABASE_ID
 - DISCORD_WEBHOOK_URL          # GitHub Actions에서 secrets.DISCORD_WEBHOOK_NOTION_URL을 여기에 매핑
+- NOTION_WATCH_BOOTSTRAP_HOURS # (선택) 상태 파일이 없을 때 조회할 시간 범위, 기본 12
+- NOTION_WATCH_FP_TTL_DAYS     # (선택) 카드 지문 보관 기간(일), 기본 30
+
+상태
+- STATE_DIR/notion_watch.json 에 마지막으로 처리한 last_edited_time(워터마크)을 저장하고
+  다음 실행은 그 시각 이후 변경분만 조회
+- 같은 파일에 페이지별 메시지 지문을 저장해, 표시 내용(Name/Week/Submitter/Link/More Links)이
+  그대로인 편집은 다시 보내지 않음
 
 실행 예)
 python -m AI_study_automation.scripts.notion_watch
+python -m AI_study_automation notion_watch --hours 48   # 상태 파일이 없을 때 48시간 전부터
 """
 
+import argparse
 import re
-import time
-import requests
 from datetime import datetime, timedelta, timezone
 
 # 패키지/경로에 따라 둘 다 지원 (패키지로도, 스크립트로도 동작)
 try:
-    from AI_study_automation.scripts.utils import get_env, post_discord, KST
+    from AI_study_automation.scripts.utils import get_env, DiscordQueue, load_state, save_state, fingerprint, FingerprintCache, KST
+    from AI_study_automation.scripts.notion_client import get_client
+    from AI_study_automation.scripts.metrics import traced
+    from AI_study_automation.scripts.schema import get_decoder, PROBLEMS
 except Exception:
-    from scripts.utils import get_env, post_discord, KST
+    from scripts.utils import get_env, DiscordQueue, load_state, save_state, fingerprint, FingerprintCache, KST
+    from scripts.notion_client import get_client
+    from scripts.metrics import traced
+    from scripts.schema import get_decoder, PROBLEMS
 
 
 # ─────────────────────────────────────────────────────
 # ENV
 # ─────────────────────────────────────────────────────
-NOTION_API_KEY     = get_env("NOTION_API_KEY")
-NOTION_DATABASE_ID = get_env("NOTION_DATABASE_ID")
+# import 시에는 읽지 않고 configure()에서 읽음
+NOTION_API_KEY = NOTION_DATABASE_ID = DISCORD_WEBHOOK_URL = None
+BOOTSTRAP_HOURS = 12
+FP_TTL_DAYS     = 30.0
+FP_MAX_ENTRIES  = 5000
+STATE_NAME      = "notion_watch"
 
-# ✅ YAML에서 secrets.DISCORD_WEBHOOK_NOTION_URL → (env) DISCORD_WEBHOOK_URL 로 매핑해 전달
-DISCORD_WEBHOOK_URL = get_env("DISCORD_WEBHOOK_NOTION_URL")
+URL_RE = re.compile(r"(https?://\S+)", re.IGNORECASE)
 
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_API_KEY}",
-    "Notion-Version": "2022-06-28",
-    "Content-Type": "application/json",
-}
+def configure():
+    """ENV(.env 포함) → 모듈 설정. 필수 값이 없으면 RuntimeError"""
+    global NOTION_API_KEY, NOTION_DATABASE_ID, DISCORD_WEBHOOK_URL, BOOTSTRAP_HOURS, FP_TTL_DAYS
+    NOTION_API_KEY     = get_env("NOTION_API_KEY")
+    NOTION_DATABASE_ID = get_env("NOTION_DATABASE_ID")
 
-URL_RE = re.compile(r"(https?://\S+)", re.IGNORECASE)
+    # ✅ YAML에서 secrets.DISCORD_WEBHOOK_NOTION_URL → (env) DISCORD_WEBHOOK_URL 로 매핑해 전달
+    DISCORD_WEBHOOK_URL = get_env("DISCORD_WEBHOOK_NOTION_URL")
+
+    BOOTSTRAP_HOURS = int(get_env("NOTION_WATCH_BOOTSTRAP_HOURS", "12"))
+    FP_TTL_DAYS     = float(get_env("NOTION_WATCH_FP_TTL_DAYS", "30"))
 
 
 # ─────────────────────────────────────────────────────
@@ -49,13 +70,6 @@ def iso_utc(dt: datetime) -> str:
     return dt.astimezone(timezone.utc).isoformat()
 
 
-def rich_text_to_str(rt) -> str:
-    """Notion rich_text[] → plain text"""
-    if not rt:
-        return ""
-    return "".join([b.get("plain_text", "") for b in rt])
-
-
 def extract_links(text: str):
     """텍스트에서 URL만 추출(중복 제거하며 입력 순서 유지)"""
     links, seen = [], set()
@@ -66,25 +80,20 @@ def extract_links(text: str):
     return links
 
 
-def page_to_message(page) -> str:
-    """
-    Notion 페이지 → 디스코드용 메시지 포맷
-    필요한 Notion 속성(정확한 이름/타입으로 구성되어 있어야 함):
-      - Name (title)
-      - Week (date)
-      - Submitter (rich_text)
-      - Link (url)
-      - More Links (rich_text)  # 내부에 여러 URL이 섞여 있는 자유 텍스트
-    """
-    props = page.get("properties", {})
+# 카드에 쓰는 속성 (타입은 config/schema.md)
+CARD_PROPS = ["Name", "Week", "Submitter", "Link", "More Links"]
 
-    title     = rich_text_to_str(props.get("Name", {}).get("title", [])) or "(No title)"
-    week      = (props.get("Week", {}) or {}).get("date", {}).get("start") or "-"
-    submitter = rich_text_to_str(props.get("Submitter", {}).get("rich_text", [])) or "-"
-    main_link = (props.get("Link", {}) or {}).get("url") or ""
 
-    more_links_txt = rich_text_to_str(props.get("More Links", {}).get("rich_text", []))
-    more_links     = extract_links(more_links_txt)
+def page_to_message(rec) -> str:
+    """
+    디코딩한 문제 카드(CARD_PROPS 레코드) → 디스코드용 메시지 포맷
+      - More Links: 내부에 여러 URL이 섞여 있는 자유 텍스트
+    """
+    title     = rec.name or "(No title)"
+    week      = rec.week or "-"
+    submitter = rec.submitter or "-"
+    main_link = rec.link or ""
+    more_links = extract_links(rec.more_links)
 
     lines = [
         "📣 Notion 문제 업데이트 📣",
@@ -121,30 +130,65 @@ def page_to_message(page) -> str:
 # ─────────────────────────────────────────────────────
 # Query & Main
 # ─────────────────────────────────────────────────────
-def query_recent_pages(hours: int = 12):
+@traced("query_recent_pages")
+def query_recent_pages(hours: int = 12, since: str = None):
     """
-    최근 편집 페이지 조회 (기본: 지난 12시간)
+    최근 편집 페이지 조회 (기본: 지난 12시간, since(ISO)가 있으면 그 시각부터)
     - last_edited_time >= since
     - 오름차순 정렬
+    - 커서를 따라가며 한 건씩 CARD_PROPS 레코드로 디코딩해 yield (제너레이터)
     """
-    since = datetime.now(KST) - timedelta(hours=hours)
-    url = f"https://api.notion.com/v1/databases/{NOTION_DATABASE_ID}/query"
-    payload = {
-        "filter": {
+    if not since:
+        since = iso_utc(datetime.now(KST) - timedelta(hours=hours))
+    yield from get_decoder(PROBLEMS, CARD_PROPS).decode(get_client().iter_query(
+        NOTION_DATABASE_ID,
+        filter={
             "timestamp": "last_edited_time",
-            "last_edited_time": {"on_or_after": iso_utc(since)},
+            "last_edited_time": {"on_or_after": since},
         },
-        "sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}],
-        "page_size": 50,
-    }
-    r = requests.post(url, headers=HEADERS, json=payload, timeout=25)
-    if r.status_code >= 400:
-        print("[NOTION][ERROR]", r.status_code, r.text[:300])
-    r.raise_for_status()
-    return r.json().get("results", [])
+        sorts=[{"timestamp": "last_edited_time", "direction": "ascending"}],
+        timeout=25,
+        props=CARD_PROPS,
+    ))
+
 
+_warm = None   # 상주 프로세스(daemon)에서는 직전 실행의 상태를 파일 대신 메모리에서 재사용
 
+
+def load_watermark():
+    """
+    상태 파일 → (since, seen, fingerprints)
+    - since: 이미 처리한 가장 늦은 last_edited_time
+    - seen : since와 같은 시각에 처리한 page_id 집합
+      (Notion의 last_edited_time은 분 단위라 on_or_after 조회 시 경계가 겹침)
+      보낼지 말지는 지문이 정하고(같은 분 안의 두 번째 수정도 놓치지 않음), seen은 워터마크 갱신에만 씀
+    - fingerprints: page_id → 마지막으로 보낸 메시지 지문
+    """
+    if _warm is not None:
+        since, seen, fps = _warm
+        return since, set(seen), fps
+    state = load_state(STATE_NAME, {}) or {}
+    fps = FingerprintCache(FP_MAX_ENTRIES, FP_TTL_DAYS * 86400).load(state.get("fingerprints"))
+    return state.get("since"), set(state.get("seen", [])), fps
+
+
+def save_watermark(since, seen, fps):
+    global _warm
+    save_state(STATE_NAME, {"since": since, "seen": sorted(seen), "fingerprints": fps.dump()})
+    _warm = (since, set(seen), fps)
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Notion 문제 DB 변경 → Discord 카드")
+    ap.add_argument("--hours", type=int, default=None,
+                    help="워터마크(상태 파일)가 없을 때 조회할 시간 범위 (기본 NOTION_WATCH_BOOTSTRAP_HOURS, 12)")
+    return ap.parse_args()
+
+
+@traced("notion_watch.main")
 def main():
+    args = parse_args()
+    configure()
     # 필수 ENV 확인
     missing = []
     if not NOTION_API_KEY:
@@ -156,20 +200,46 @@ def main():
     if missing:
         raise RuntimeError(f"Missing environment variables: {', '.join(missing)}")
 
-    pages = query_recent_pages(hours=12)
-    if not pages:
+    since, seen, fps = load_watermark()
+    queue = DiscordQueue(DISCORD_WEBHOOK_URL)
+    processed = []   # (page_id, last_edited_time, 새 지문 또는 None=변경 없음) — 조회 순서 유지
+    skipped = 0
+    for rec in query_recent_pages(hours=args.hours or BOOTSTRAP_HOURS, since=since):
+        edited = rec.last_edited_time
+        content = page_to_message(rec)
+        fp = fingerprint(content)
+        if fps.unchanged(rec.id, fp):
+            if not (edited == since and rec.id in seen):   # 경계에서 다시 조회된 페이지는 세지 않음
+                skipped += 1
+            processed.append((rec.id, edited, None))
+            continue
+        queue.add(content, key=rec.id)
+        processed.append((rec.id, edited, fp))
+
+    # 카드들을 embed로 묶어 웹훅 요청 수를 최소화 (10개/6000자 단위)
+    failed = queue.flush()
+
+    sent = 0
+    blocked = False   # 전송 실패 이후로는 워터마크를 올리지 않아 다음 실행에서 재시도
+    for pid, edited, fp in processed:
+        if pid in failed:
+            blocked = True
+        elif fp is not None:
+            fps.put(pid, fp)
+            sent += 1
+        if not blocked and edited:
+            if edited != since:
+                since, seen = edited, set()
+            seen.add(pid)
+
+    if since:
+        save_watermark(since, seen, fps)
+    if skipped:
+        print(f"[INFO] {skipped} page(s) edited without visible changes, skipped.")
+    if sent:
+        print(f"[DISCORD] {sent} card(s) delivered")
+    else:
         print("[INFO] No recent updates.")
-        return
-
-    for idx, page in enumerate(pages, 1):
-        content = page_to_message(page)
-        try:
-            post_discord(DISCORD_WEBHOOK_URL, content=content)
-            print(f"[DISCORD] sent {idx}/{len(pages)}")
-        except Exception as e:
-            print("[DISCORD][EXCEPTION]", repr(e))
-        time.sleep(1)
-
 
 if __name__ == "__main__":
     main()
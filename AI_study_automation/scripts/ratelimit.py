@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/scripts/ratelimit.py
+"""
+호출 속도 제한 / 재시도 대기 계산 도구
+
+- TokenBucket: 스레드 안전한 토큰 버킷 (rate 개/초, 최대 capacity 개 버스트)
+- backoff_delay: 지수 백오프 + full jitter, Retry-After가 있으면 그 값을 우선
+"""
+
+import random
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def _take(self, tokens: float) -> float:
+        """토큰이 있으면 차감하고 0, 없으면 모자란 만큼 채워질 때까지의 시간(초)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """토큰을 얻을 때까지 블록. 실제로 기다린 시간(초)을 반환"""
+        waited = 0.0
+        while True:
+            wait = self._take(tokens)
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float):
+        """서버가 Retry-After로 멈추라고 할 때 모든 호출자가 함께 쉬도록 버킷을 비움"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+def parse_retry_after(value) -> float | None:
+    """Retry-After 헤더(초, 소수 허용) → float. 해석 불가면 None"""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0, retry_after: float | None = None) -> float:
+    """
+    attempt(0부터)번째 재시도 전 대기 시간
+    - Retry-After가 있으면 그 값 + 약간의 jitter
+    - 없으면 min(cap, base * 2^attempt) 범위의 full jitter
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, base)
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/scripts/schema.py
+"""
+Notion 페이지 디코더 (config/schema.md 기반, 모든 스크립트 공용)
+
+- schema.md의 DB별 필드 표(| **필드명** | 타입 | 설명 |)를 한 번 읽어
+  DB(또는 쓰는 속성 묶음)마다 (속성 이름, 타입별 추출 함수) 목록을 한 번만 만들어 둠
+- 페이지 dict → namedtuple 레코드 (id, last_edited_time, 필드들...)
+  필드 이름은 속성 이름의 snake_case: "File Path" → file_path, "Late (min)" → late_min
+- 원본 JSON은 디코딩 직후 버림 → 큰 결과에서도 메모리에 남는 건 작은 튜플뿐
+
+사용 예)
+decode = get_decoder(SUBMISSIONS, ["Submitter", "Commit Time"])
+for rec in decode.decode(get_client().iter_query(dbid, ...)):
+    rec.submitter, rec.commit_time
+"""
+
+import functools
+import os
+import re
+from collections import namedtuple
+from typing import Dict, Iterable, Iterator, Optional, Sequence
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "schema.md")
+
+# schema.md 섹션 제목 괄호 안의 DB 이름
+PROBLEMS    = "Problem Management"
+SUBMISSIONS = "Submissions Log"
+ATTENDANCE  = "Attendance"
+
+_HEADING_RE = re.compile(r"^##\s.*\(([^)]+)\)\s*$")
+_FIELD_RE   = re.compile(r"^\|\s*\*\*(.+?)\*\*\s*\|\s*([a-z_]+)")
+
+
+# ─────────────────────────────────────────────────────
+# 타입별 추출 함수: 속성 값 dict(없으면 None) → 파이썬 값
+# ─────────────────────────────────────────────────────
+def _text(p) -> str:
+    """title / rich_text → 이어 붙인 plain_text, people → 이름을 쉼표로"""
+    if not p:
+        return ""
+    rt = p.get("rich_text") or p.get("title")
+    if rt:
+        if len(rt) == 1:   # 대부분 조각 하나
+            return rt[0].get("plain_text", "")
+        return "".join(b.get("plain_text", "") for b in rt)
+    if p.get("people"):
+        return ", ".join(u.get("name") or "" for u in p["people"])
+    return ""
+
+def _date(p) -> Optional[str]:
+    return ((p or {}).get("date") or {}).get("start")
+
+def _select(p) -> Optional[str]:
+    p = p or {}
+    return (p.get("select") or p.get("status") or {}).get("name")
+
+def _checkbox(p) -> bool:
+    return bool((p or {}).get("checkbox"))
+
+def _number(p):
+    return (p or {}).get("number")
+
+def _url(p) -> Optional[str]:
+    return (p or {}).get("url")
+
+EXTRACTORS = {
+    "title": _text, "rich_text": _text, "people": _text,
+    "date": _date, "select": _select, "status": _select,
+    "checkbox": _checkbox, "number": _number, "url": _url,
+}
+
+
+# ─────────────────────────────────────────────────────
+# Schema
+# ─────────────────────────────────────────────────────
+def field_name(prop: str) -> str:
+    """속성 이름 → 레코드 필드 이름"""
+    return re.sub(r"[^0-9a-z]+", "_", prop.lower()).strip("_")
+
+@functools.lru_cache(maxsize=None)
+def load_schema(path: str = SCHEMA_PATH) -> Dict[str, Dict[str, str]]:
+    """schema.md → {DB 이름: {속성 이름: 타입}} (표 순서 유지)"""
+    schema, current = {}, None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            m = _HEADING_RE.match(line.strip())
+            if m:
+                current = schema.setdefault(m.group(1).strip(), {})
+                continue
+            m = _FIELD_RE.match(line.strip())
+            if m and current is not None:
+                current[m.group(1).strip()] = m.group(2)
+    return schema
+
+
+class Decoder:
+    """DB 하나(또는 그 일부 속성)의 디코더. decoder(page) → 레코드"""
+
+    def __init__(self, db: str, fields: Dict[str, str]):
+        unknown = {t for t in fields.values() if t not in EXTRACTORS}
+        if unknown:
+            raise ValueError(f"{db}: unsupported property type(s) {sorted(unknown)}")
+        self.db = db
+        self.props = tuple(fields)
+        self.record = namedtuple(
+            "".join(w.capitalize() for w in re.findall(r"[A-Za-z0-9]+", db)),
+            ["id", "last_edited_time", *(field_name(p) for p in fields)],
+        )
+        self.columns = tuple((prop, EXTRACTORS[t]) for prop, t in fields.items())   # 레코드 필드 순서
+
+    def __call__(self, page: dict):
+        p = page.get("properties") or {}
+        return self.record._make((page.get("id"), page.get("last_edited_time"),
+                                  *[extract(p.get(prop)) for prop, extract in self.columns]))
+
+    def decode(self, pages: Iterable[dict]) -> Iterator:
+        """페이지 스트림 → 레코드 스트림 (한 페이지씩 디코딩하고 원본은 바로 버림)"""
+        return map(self, pages)
+
+
+@functools.lru_cache(maxsize=None)
+def _decoder(db: str, props: Optional[tuple]) -> Decoder:
+    fields = load_schema().get(db)
+    if fields is None:
+        raise KeyError(f"unknown database in schema.md: {db}")
+    if props is not None:
+        missing = [p for p in props if p not in fields]
+        if missing:
+            raise KeyError(f"{db}: unknown properties {missing}")
+        fields = {p: fields[p] for p in props}
+    return Decoder(db, fields)
+
+def get_decoder(db: str, props: Sequence[str] = None) -> Decoder:
+    """DB 이름(PROBLEMS/SUBMISSIONS/ATTENDANCE) → 디코더 (props를 주면 그 속성만, 프로세스당 한 번 생성)"""
+    return _decoder(db, tuple(props) if props is not None else None)
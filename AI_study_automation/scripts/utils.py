@@ -1,35 +1,366 @@
-import os, time, requests
-from datetime import datetime, timezone, timedelta
-from dotenv import load_dotenv
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+import os, json, time, hashlib, threading, contextvars
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone, timedelta
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import requests
+
+try:
+    from AI_study_automation.scripts.ratelimit import backoff_delay, parse_retry_after
+    from AI_study_automation.scripts import metrics
+except Exception:
+    from scripts.ratelimit import backoff_delay, parse_retry_after
+    from scripts import metrics
 
 KST = timezone(timedelta(hours=9))
 
-def get_env(key: str) -> str:
+# 실행 간에 유지할 로컬 상태(워터마크/캐시 등). Actions에서는 actions/cache로 보존
+DEFAULT_STATE_DIR = os.path.join(os.path.dirname(__file__), "..", "state")
+
+_env_loaded = False
+
+def load_env():
+    """
+    .env를 환경변수로 로드 (프로세스당 한 번, 처음 get_env를 부를 때)
+    - import만으로는 아무것도 읽지 않으므로 --help/할 일 없는 실행은 설정 없이 바로 끝남
+    - 이미 설정된 환경변수는 덮어쓰지 않음
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+def get_env(key: str, default=None) -> str:
+    load_env()
     v = os.environ.get(key)
     if not v:
+        if default is not None:
+            return default
         raise RuntimeError(f"Missing environment variable: {key}")
     return v
 
-def post_discord(webhook_url: str, content=None, embeds=None, allow_roles=False):
+def state_dir() -> str:
+    """ENV STATE_DIR (.env 포함), 없으면 기본 경로"""
+    return get_env("STATE_DIR", "") or DEFAULT_STATE_DIR
+
+def load_state(name: str, default=None):
+    """STATE_DIR/<name>.json 읽기 (없거나 깨졌으면 default)"""
+    path = os.path.join(state_dir(), f"{name}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return default
+
+def save_state(name: str, data):
+    """STATE_DIR/<name>.json 원자적 쓰기 (임시 파일 → rename)"""
+    os.makedirs(state_dir(), exist_ok=True)
+    path = os.path.join(state_dir(), f"{name}.json")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def fingerprint(*parts) -> str:
+    """문자열 조각들의 짧은 해시 (변경 감지용)"""
+    h = hashlib.sha1()
+    for p in parts:
+        h.update(str(p).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+class FingerprintCache:
+    """
+    key → 지문 캐시 (LRU + TTL)
+    - max_entries 초과 시 가장 오래 안 쓴 항목부터 제거
+    - ttl(초)이 지난 항목은 없는 것으로 취급
+    - dump()/load()로 상태 파일에 저장 가능한 리스트 형태로 변환
+    """
+    def __init__(self, max_entries: int = 5000, ttl: float = 30 * 86400):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()   # key -> (fp, stamp)
+
+    def get(self, key):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        fp, stamp = item
+        if time.time() - stamp > self.ttl:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return fp
+
+    def unchanged(self, key, fp) -> bool:
+        return self.get(key) == fp
+
+    def put(self, key, fp):
+        self._data[key] = (fp, time.time())
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def dump(self) -> list:
+        now = time.time()
+        return [[k, fp, stamp] for k, (fp, stamp) in self._data.items() if now - stamp <= self.ttl]
+
+    def load(self, rows):
+        for k, fp, stamp in rows or []:
+            self._data[k] = (fp, stamp)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+        return self
+
+class DiscordSender:
+    """
+    Discord 웹훅 전송기 (프로세스 공용)
+    - keep-alive Session 재사용
+    - 응답의 X-RateLimit-Bucket/Remaining/Reset-After를 버킷별로 기억해
+      남은 횟수가 0이면 리셋까지 미리 기다림
+    - 429(Retry-After는 소수 초), 5xx, 연결 오류는 백오프하며 max_retries회까지 재시도
+    - 단 POST(새 메시지)는 5xx/응답 대기 중 끊김이면 이미 올라갔을 수 있으므로
+      중복 전송을 막기 위해 429/연결 실패만 재시도 (NotionClient의 페이지 생성과 같은 규칙)
+    """
+    def __init__(self, max_retries: int = 5, timeout: float = 20):
+        import requests   # 실제로 보낼 때만 import (CLI 시작 시간)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._lock = threading.Lock()
+        self._route_bucket = {}   # webhook url → bucket id
+        self._buckets = {}        # bucket id → (remaining, reset_at[monotonic])
+        self._global_until = 0.0
+
+    def _bucket_delay(self, route: str) -> float:
+        """보내도 되면 남은 횟수를 1 차감하고 0, 아니면 기다려야 할 시간(초)"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._global_until - now
+            bucket = self._buckets.get(self._route_bucket.get(route))
+            if bucket:
+                remaining, reset_at = bucket
+                if remaining <= 0 and reset_at > now:
+                    wait = max(wait, reset_at - now)
+                elif remaining > 0 and wait <= 0:
+                    # 같은 버킷을 쓰는 다른 스레드를 위해 미리 1회 차감
+                    self._buckets[self._route_bucket[route]] = (remaining - 1, reset_at)
+            return wait
+
+    def _wait_for_bucket(self, route: str) -> float:
+        waited = 0.0
+        while True:
+            wait = self._bucket_delay(route)
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def _retry_after_429(self, r) -> float | None:
+        """429 응답의 대기 시간. 전역 한도면 모든 웹훅을 그동안 멈춤"""
+        retry_after = parse_retry_after(r.headers.get("Retry-After"))
+        try:
+            body = r.json()
+        except ValueError:
+            body = {}
+        if retry_after is None:
+            retry_after = parse_retry_after(body.get("retry_after"))
+        if body.get("global") or r.headers.get("X-RateLimit-Global"):
+            with self._lock:
+                self._global_until = time.monotonic() + (retry_after or 1.0)
+        return retry_after
+
+    def _remember(self, route: str, r):
+        h = r.headers
+        bucket = h.get("X-RateLimit-Bucket") or route
+        remaining = h.get("X-RateLimit-Remaining")
+        reset_after = parse_retry_after(h.get("X-RateLimit-Reset-After"))
+        with self._lock:
+            self._route_bucket[route] = bucket
+            if remaining is not None and reset_after is not None:
+                self._buckets[bucket] = (int(remaining), time.monotonic() + reset_after)
+
+    def request(self, method: str, url: str, payload=None, params=None) -> "requests.Response":
+        import requests
+        route = url.split("?", 1)[0]
+        idempotent = method != "POST"
+        retryable_exc = (requests.ConnectionError, requests.Timeout) if idempotent else (requests.ConnectTimeout,)
+        attempt, waited, r = 0, 0.0, None
+        started = time.perf_counter()
+        try:
+            while True:
+                waited += self._wait_for_bucket(route)
+                try:
+                    r = self.session.request(method, url, json=payload, params=params, timeout=self.timeout)
+                except retryable_exc as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = backoff_delay(attempt)
+                    print(f"[DISCORD][RETRY] {e.__class__.__name__}, {delay:.1f}s 후 재시도")
+                    time.sleep(delay)
+                    waited += delay
+                    attempt += 1
+                    continue
+
+                self._remember(route, r)
+                if r.status_code != 429 and (r.status_code < 500 or not idempotent):
+                    break
+                if attempt >= self.max_retries:
+                    break
+                if r.status_code == 429:
+                    retry_after = self._retry_after_429(r)
+                else:
+                    retry_after = parse_retry_after(r.headers.get("Retry-After"))
+                delay = backoff_delay(attempt, retry_after=retry_after)
+                print(f"[DISCORD][RETRY] {r.status_code}, {delay:.1f}s 후 재시도")
+                time.sleep(delay)
+                waited += delay
+                attempt += 1
+        finally:
+            metrics.record(
+                "discord", method, "webhook/messages" if "/messages/" in route else "webhook",
+                r.status_code if r is not None else None,
+                time.perf_counter() - started, retries=attempt, throttle_wait=waited,
+                req_bytes=len(r.request.body or b"") if r is not None else 0,
+                resp_bytes=len(r.content) if r is not None else 0,
+            )
+
+        # ↓ 디버그: 실패 시 서버 응답 보여주기
+        if r.status_code >= 400:
+            print("Discord error:", r.status_code, r.text)
+        r.raise_for_status()
+        return r
+
+    def post(self, webhook_url: str, payload: dict, wait: bool = False):
+        """wait=True면 생성된 메시지 객체(JSON)를 돌려받음"""
+        r = self.request("POST", webhook_url, payload, params={"wait": "true"} if wait else None)
+        return r.json() if wait else None
+
+
+_discord = None
+_discord_lock = threading.Lock()
+
+def get_discord_sender() -> DiscordSender:
+    global _discord
+    if _discord is None:
+        with _discord_lock:
+            if _discord is None:
+                _discord = DiscordSender(max_retries=int(os.environ.get("DISCORD_MAX_RETRIES", "5")))
+    return _discord
+
+DISCORD_CONTENT_SAFE = 1800   # discord_payload가 본문을 자르는 길이
+
+def discord_payload(content=None, embeds=None, allow_roles=False, allowed_mentions=None) -> dict:
     content = (content or "")
-    if len(content) > 1800:
-        content = content[:1800] + "\n…(truncated)"
-    payload = {
+    if len(content) > DISCORD_CONTENT_SAFE:
+        content = content[:DISCORD_CONTENT_SAFE] + "\n…(truncated)"
+    return {
         "content": content,
         "embeds": embeds or [],
-        "allowed_mentions": {"parse": ["roles"] if allow_roles else []}
+        "allowed_mentions": allowed_mentions or {"parse": ["roles"] if allow_roles else []}
     }
-    r = requests.post(webhook_url, json=payload, timeout=20)
-    if r.status_code == 429:
-        wait = int(r.headers.get("Retry-After", "1"))
-        time.sleep(wait)
-        r = requests.post(webhook_url, json=payload, timeout=20)
-    # ↓ 디버그: 실패 시 서버 응답 보여주기
-    if r.status_code >= 400:
-        print("Discord error:", r.status_code, r.text)
-    r.raise_for_status()
-
-def chunk_embeds(embeds, size=10):
-    for i in range(0, len(embeds), size):
-        yield embeds[i:i+size]
+
+def post_discord(webhook_url: str, content=None, embeds=None, allow_roles=False, allowed_mentions=None):
+    get_discord_sender().post(webhook_url, discord_payload(content, embeds, allow_roles, allowed_mentions))
+
+def split_content(lines, limit=DISCORD_CONTENT_SAFE):
+    """
+    줄 목록 → 줄 단위로 나눈 본문 목록 (각 limit자 이하, 줄 중간에서 자르지 않음)
+    한 줄이 limit보다 길면 그 줄만 단독 메시지 (discord_payload가 자름)
+    """
+    chunk, size = [], 0
+    for line in lines:
+        if chunk and size + 1 + len(line) > limit:
+            yield "\n".join(chunk)
+            chunk, size = [], 0
+        size += len(line) + (1 if chunk else 0)
+        chunk.append(line)
+    if chunk:
+        yield "\n".join(chunk)
+
+# Discord 웹훅 한도
+DISCORD_CONTENT_LIMIT     = 2000
+DISCORD_EMBEDS_PER_MSG    = 10
+DISCORD_EMBED_TOTAL_LIMIT = 6000   # 한 메시지의 모든 embed 글자 수 합
+DISCORD_EMBED_DESC_LIMIT  = 4096
+
+def embed_size(embed: dict) -> int:
+    """Discord가 6000자 한도에 세는 필드들의 글자 수"""
+    n = len(embed.get("title") or "") + len(embed.get("description") or "")
+    n += len((embed.get("footer") or {}).get("text") or "") + len((embed.get("author") or {}).get("name") or "")
+    for f in embed.get("fields") or []:
+        n += len(f.get("name") or "") + len(f.get("value") or "")
+    return n
+
+def chunk_embeds(embeds, size=DISCORD_EMBEDS_PER_MSG, max_chars=DISCORD_EMBED_TOTAL_LIMIT):
+    """embed 목록을 요청 단위로 분할 (개수 size개, 글자 수 합 max_chars 이하)"""
+    batch, total = [], 0
+    for e in embeds:
+        n = embed_size(e)
+        if batch and (len(batch) >= size or total + n > max_chars):
+            yield batch
+            batch, total = [], 0
+        batch.append(e)
+        total += n
+    if batch:
+        yield batch
+
+class DiscordQueue:
+    """
+    웹훅 하나로 보낼 메시지를 모았다가 최소 요청 수로 전송
+    - add(text, key): 메시지 하나 = embed 하나(description)
+    - flush(): 10개/6000자 단위로 묶어 전송, 실패한 메시지의 key 집합을 반환
+    """
+    def __init__(self, webhook_url: str, content: str = ""):
+        self.webhook_url = webhook_url
+        self.content = content[:DISCORD_CONTENT_LIMIT]   # 요청마다 붙일 본문(선택)
+        self._items = []   # (key, embed)
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, text: str, key=None, **embed):
+        if len(text) > DISCORD_EMBED_DESC_LIMIT:
+            text = text[:DISCORD_EMBED_DESC_LIMIT - 20] + "\n…(truncated)"
+        embed["description"] = text
+        self._items.append((key, embed))
+
+    def flush(self) -> set:
+        failed = set()
+        items, self._items = self._items, []
+        keys_by_id = {id(e): k for k, e in items}
+        for batch in chunk_embeds([e for _, e in items]):
+            try:
+                post_discord(self.webhook_url, content=self.content, embeds=batch)
+                print(f"[DISCORD] sent {len(batch)} embed(s)")
+            except Exception as e:
+                print("[DISCORD][EXCEPTION]", repr(e))
+                failed.update(keys_by_id[id(x)] for x in batch)
+        return failed
+
+def run_parallel(fn, items, max_workers=4):
+    """
+    items 각각에 fn(item)을 스레드 풀(최대 max_workers)로 실행
+    예외는 삼키지 않고 결과에 담아 돌려줌: [(item, result, error), ...] (입력 순서 유지)
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        out = []
+        for it in items:
+            try:
+                out.append((it, fn(it), None))
+            except Exception as e:
+                out.append((it, None, e))
+        return out
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        # contextvars(계측 라벨 등)를 작업 스레드로 전달
+        futures = [ex.submit(contextvars.copy_context().run, fn, it) for it in items]
+    out = []
+    for it, fut in zip(items, futures):
+        err = fut.exception()
+        out.append((it, None if err else fut.result(), err))
+    return out
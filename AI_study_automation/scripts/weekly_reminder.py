@@ -13,41 +13,51 @@
 
 실행 예)
 python -m AI_study_automation.scripts.weekly_reminder
+python -m AI_study_automation weekly_reminder --dry-run   # 보내지 않고 본문만 출력
 """
 
-import os, json, requests
+import argparse
 from datetime import datetime, timedelta, timezone
 from typing import List, Tuple
 
-# utils 모듈: get_env(key, default=None), post_discord(url, content=..., **kwargs), KST(tzinfo)
+# utils 모듈: get_env(key, default=None), post_discord(url, content=..., allowed_mentions=...), KST(tzinfo)
 try:
     from AI_study_automation.scripts.utils import get_env, post_discord, KST
+    from AI_study_automation.scripts.notion_client import get_client
+    from AI_study_automation.scripts.metrics import traced
+    from AI_study_automation.scripts.notion_mirror import get_mirror
+    from AI_study_automation.scripts.members import get_directory
+    from AI_study_automation.scripts.schema import get_decoder, PROBLEMS
 except Exception:
     from scripts.utils import get_env, post_discord, KST
+    from scripts.notion_client import get_client
+    from scripts.metrics import traced
+    from scripts.notion_mirror import get_mirror
+    from scripts.members import get_directory
+    from scripts.schema import get_decoder, PROBLEMS
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 # ENV & CONSTANTS
 # ──────────────────────────────────────────────────────────────────────────────
-NOTION_API_KEY       = get_env("NOTION_API_KEY")
-NOTION_DATABASE_ID   = get_env("NOTION_DATABASE_ID")
+# import 시에는 읽지 않고 configure()에서 읽음
+NOTION_API_KEY = NOTION_DATABASE_ID = DISCORD_WEBHOOK_URL = None
+NOTION_DB_URL        = ""
+ROLE_ID              = ""
 
-# YAML에서 secrets.DISCORD_WEBHOOK_NOTION_URL → DISCORD_WEBHOOK_URL_REMINDER로 매핑해 전달
-DISCORD_WEBHOOK_URL  = get_env("DISCORD_WEBHOOK_NOTION_URL")
+def configure():
+    """ENV(.env 포함) → 모듈 설정. 필수 값이 없으면 RuntimeError"""
+    global NOTION_API_KEY, NOTION_DATABASE_ID, DISCORD_WEBHOOK_URL, NOTION_DB_URL, ROLE_ID
+    NOTION_API_KEY       = get_env("NOTION_API_KEY")
+    NOTION_DATABASE_ID   = get_env("NOTION_DATABASE_ID")
 
-NOTION_DB_URL        = get_env("NOTION_DB_URL", "")
-ROLE_ID              = get_env("ROLE_ID_PROBLEM_SETTER")  # 선택
+    # YAML에서 secrets.DISCORD_WEBHOOK_NOTION_URL → DISCORD_WEBHOOK_URL_REMINDER로 매핑해 전달
+    DISCORD_WEBHOOK_URL  = get_env("DISCORD_WEBHOOK_NOTION_URL")
 
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_API_KEY}",
-    "Notion-Version": "2022-06-28",
-    "Content-Type": "application/json",
-}
+    NOTION_DB_URL        = get_env("NOTION_DB_URL", "")
+    ROLE_ID              = get_env("ROLE_ID_PROBLEM_SETTER", "")  # 선택
 
-# members.json: {"홍길동":"123456789012345678", "Alice":"2345..."}
-MEMBERS_MAP_PATH = os.path.realpath(
-    os.path.join(os.path.dirname(__file__), "..", "config", "members.json")
-)
+# 멘션용 Discord ID는 members.get_directory() (config/members.json)에서 조회
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -56,11 +66,6 @@ MEMBERS_MAP_PATH = os.path.realpath(
 def iso_utc(dt: datetime) -> str:
     return dt.astimezone(timezone.utc).isoformat()
 
-def rich_text_to_str(rt) -> str:
-    if not rt:
-        return ""
-    return "".join([b.get("plain_text","") for b in rt])
-
 def uniq_preserve(seq: List[str]) -> List[str]:
     seen, out = set(), []
     for s in seq:
@@ -71,43 +76,24 @@ def uniq_preserve(seq: List[str]) -> List[str]:
 def split_csv(text: str) -> List[str]:
     return [t.strip() for t in (text or "").split(",") if t.strip()]
 
-def load_member_map() -> dict:
-    try:
-        with open(MEMBERS_MAP_PATH, "r", encoding="utf-8") as f:
-            raw = json.load(f)
-        # 키를 소문자/trim으로 통일해 유연 매칭
-        return { (k or "").strip().lower(): (v or "").strip() for k, v in raw.items() if (k and v) }
-    except FileNotFoundError:
-        return {}
-
-def names_to_user_ids(names: List[str], name2id: dict) -> List[str]:
-    ids = []
-    for n in names:
-        k = (n or "").strip().lower()
-        if k and (k in name2id):
-            ids.append(name2id[k])
-    return uniq_preserve(ids)
-
-def send_discord(content: str, allowed_mentions: dict | None = None):
-    """
-    post_discord 유틸이 allowed_mentions를 지원하지 않을 수 있어 직접 호출을 래핑.
-    utils.post_discord가 allowed_mentions를 지원한다면 그걸 써도 무방.
-    """
+@traced("send_discord")
+def send_discord(content: str, allowed_mentions: dict | None = None, dry_run: bool = False):
+    """allowed_mentions(user/role 화이트리스트)를 지정해 공용 전송기(재시도/레이트리밋)로 전송"""
+    if dry_run:
+        print(content)
+        return
     if not DISCORD_WEBHOOK_URL:
         raise RuntimeError("Missing DISCORD_WEBHOOK_URL_REMINDER")
-    payload = {"content": content}
-    if allowed_mentions is not None:
-        payload["allowed_mentions"] = allowed_mentions
-    r = requests.post(DISCORD_WEBHOOK_URL, json=payload, timeout=20)
-    if r.status_code >= 400:
-        print("[DISCORD][ERROR]", r.status_code, r.text)
-    r.raise_for_status()
-    print("[DISCORD] reminder sent:", r.status_code)
+    post_discord(DISCORD_WEBHOOK_URL, content=content, allowed_mentions=allowed_mentions)
+    print("[DISCORD] reminder sent")
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 # NOTION
 # ──────────────────────────────────────────────────────────────────────────────
+REMINDER_PROPS = ["Submitter", "Next Submitters"]
+
+@traced("query_this_week_submitters_and_next")
 def query_this_week_submitters_and_next() -> Tuple[List[str], List[str]]:
     """
     이번 주(월 00:00 ~ 다음 주 월 00:00, KST 기준)의 카드에서
@@ -118,34 +104,29 @@ def query_this_week_submitters_and_next() -> Tuple[List[str], List[str]]:
     start = (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
     end   = start + timedelta(days=7)
 
-    url = f"https://api.notion.com/v1/databases/{NOTION_DATABASE_ID}/query"
-    payload = {
-        "filter": {
-            "and": [
-                {"property": "Week", "date": {"on_or_after": iso_utc(start)}},
-                {"property": "Week", "date": {"before":     iso_utc(end)}},
-            ]
-        },
-        "page_size": 100,
-    }
-    r = requests.post(url, headers=HEADERS, json=payload, timeout=20)
-    if r.status_code >= 400:
-        print("[NOTION][ERROR]", r.status_code, r.text[:300])
-    r.raise_for_status()
-    results = r.json().get("results", [])
-
     submitters: List[str] = []
     next_submitters: List[str] = []
 
-    for p in results:
-        props = p.get("properties", {})
-        # Submitter(Text rich_text)
-        sub = rich_text_to_str(props.get("Submitter", {}).get("rich_text", []))
-        submitters.extend(split_csv(sub))
+    mirror = get_mirror()
+    if mirror is not None:
+        # 로컬 미러: 증분 동기화 후 Week 인덱스로 조회
+        mirror.sync(NOTION_DATABASE_ID, PROBLEMS)
+        for r in mirror.pages_between(NOTION_DATABASE_ID, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")):
+            submitters.extend(split_csv(r["submitter"]))
+            next_submitters.extend(split_csv(r["next_submitters"]))
+        return uniq_preserve(submitters), uniq_preserve(next_submitters)
+
+    flt = {
+        "and": [
+            {"property": "Week", "date": {"on_or_after": iso_utc(start)}},
+            {"property": "Week", "date": {"before":     iso_utc(end)}},
+        ]
+    }
+    results = get_client().iter_query(NOTION_DATABASE_ID, filter=flt, timeout=20, props=REMINDER_PROPS)
 
-        # (옵션) Next Submitters(Text rich_text)
-        ns  = rich_text_to_str(props.get("Next Submitters", {}).get("rich_text", []))
-        next_submitters.extend(split_csv(ns))
+    for rec in get_decoder(PROBLEMS, REMINDER_PROPS).decode(results):
+        submitters.extend(split_csv(rec.submitter))
+        next_submitters.extend(split_csv(rec.next_submitters))   # (옵션)
 
     return uniq_preserve(submitters), uniq_preserve(next_submitters)
 
@@ -153,7 +134,16 @@ def query_this_week_submitters_and_next() -> Tuple[List[str], List[str]]:
 # ──────────────────────────────────────────────────────────────────────────────
 # MAIN
 # ──────────────────────────────────────────────────────────────────────────────
+def parse_args():
+    ap = argparse.ArgumentParser(description="이번 주 문제 출제 리마인드")
+    ap.add_argument("--dry-run", action="store_true", help="Discord로 보내지 않고 본문만 출력")
+    return ap.parse_args()
+
+
+@traced("weekly_reminder.main")
 def main():
+    args = parse_args()
+    configure()
     # 필수 ENV 검증
     missing = []
     if not NOTION_API_KEY:     missing.append("NOTION_API_KEY")
@@ -166,12 +156,11 @@ def main():
 
     if not submitters:
         # 이번 주 카드가 없으면 간단 알림
-        post_discord(DISCORD_WEBHOOK_URL, content="🔔 이번 주 문제 카드가 없습니다. 확인 부탁드려요!")
+        send_discord("🔔 이번 주 문제 카드가 없습니다. 확인 부탁드려요!", dry_run=args.dry_run)
         return
 
     # 멘션 구성
-    name2id = load_member_map()
-    user_ids = names_to_user_ids(submitters, name2id)
+    user_ids = get_directory().discord_ids(submitters)
     user_mentions = " ".join([f"<@{uid}>" for uid in user_ids])
 
     role_mention = f"<@&{ROLE_ID}>" if ROLE_ID else "@문제제출자"
@@ -203,7 +192,7 @@ def main():
     if ROLE_ID:
         allowed["roles"] = [ROLE_ID]
 
-    send_discord(content, allowed_mentions=allowed)
+    send_discord(content, allowed_mentions=allowed, dry_run=args.dry_run)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/tests/test_daemon.py
+from datetime import datetime
+
+import pytest
+
+from AI_study_automation.daemon import daily_at, every_minutes, weekly_at
+from AI_study_automation.scripts.utils import KST
+
+
+def kst(*args):
+    return datetime(*args, tzinfo=KST)
+
+
+@pytest.mark.parametrize("now, expected", [
+    (kst(2026, 10, 14, 9, 0, 0), kst(2026, 10, 14, 9, 10)),     # 정각이면 다음 칸
+    (kst(2026, 10, 14, 9, 3, 59), kst(2026, 10, 14, 9, 10)),
+    (kst(2026, 10, 14, 9, 59, 30), kst(2026, 10, 14, 10, 0)),
+    (kst(2026, 10, 14, 23, 55), kst(2026, 10, 15, 0, 0)),       # 날짜 넘김
+])
+def test_every_minutes_aligns_to_wall_clock(now, expected):
+    assert every_minutes(10)(now) == expected
+
+
+def test_daily_at_today_or_tomorrow():
+    next_run = daily_at("23:59")
+    assert next_run(kst(2026, 10, 14, 12, 0)) == kst(2026, 10, 14, 23, 59)
+    assert next_run(kst(2026, 10, 14, 23, 59)) == kst(2026, 10, 15, 23, 59)
+
+
+@pytest.mark.parametrize("now, expected", [
+    (kst(2026, 10, 12, 10, 0), kst(2026, 10, 14, 9, 0)),    # 월 → 이번 주 수
+    (kst(2026, 10, 14, 8, 59), kst(2026, 10, 14, 9, 0)),    # 수 09:00 전
+    (kst(2026, 10, 14, 9, 0), kst(2026, 10, 21, 9, 0)),     # 수 09:00 정각 → 다음 주
+    (kst(2026, 10, 17, 9, 0), kst(2026, 10, 21, 9, 0)),     # 토 → 다음 주 수
+])
+def test_weekly_at(now, expected):
+    assert weekly_at("wed 09:00")(now) == expected
+
+
+def test_weekly_at_accepts_full_day_name():
+    assert weekly_at("Wednesday 09:00")(kst(2026, 10, 12)) == kst(2026, 10, 14, 9, 0)
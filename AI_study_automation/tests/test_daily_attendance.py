@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/tests/test_daily_attendance.py
+from AI_study_automation.scripts.daily_attendance import plan_attendance
+
+
+def test_plan_attendance_creates_updates_and_skips():
+    existing = {
+        "a": ("page-a", "Present", "2026-10-17T12:00:00.000Z"),
+        "b": ("page-b", "Absent", None),
+        "c": ("page-c", "Present", "2026-10-17T13:00:00.000+00:00"),
+    }
+    statuses = {
+        "a": ("Present", "2026-10-17T21:00:00+09:00"),   # 표기만 다르고 같은 시각 → skip
+        "b": ("Present", "2026-10-17T22:00:00+09:00"),   # 바뀜 → update
+        "c": ("Absent", None),                           # 바뀜 → update (First Submit Time 비움)
+        "d": ("Absent", None),                           # 없음 → create
+    }
+    counts, tasks = plan_attendance(existing, statuses)
+    assert counts == {"create": 0, "update": 0, "skip": 1, "error": 0}
+    assert tasks == [
+        ("b", "Present", "2026-10-17T22:00:00+09:00", "page-b"),
+        ("c", "Absent", None, "page-c"),
+        ("d", "Absent", None, None),
+    ]
+
+
+def test_plan_attendance_rerun_writes_nothing():
+    statuses = {"a": ("Absent", None)}
+    counts, tasks = plan_attendance({"a": ("page-a", "Absent", None)}, statuses)
+    assert tasks == [] and counts["skip"] == 1
+
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/tests/test_git_to_notion.py
+import io
+
+import pytest
+
+from AI_study_automation.scripts.git_to_notion import git_log_args, iter_nul_paths, parse_changed_paths
+
+PATHS = ["study/a/2026-10-17/p 1.py", "study/b/2026-10-17/we\nird.py", "README.md", "study/한글/2026-10-17/문제.py"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1 << 16])
+def test_iter_nul_paths_across_chunk_boundaries(chunk_size):
+    raw = b"\0".join(p.encode("utf-8") for p in PATHS) + b"\0"
+    assert list(iter_nul_paths(io.BytesIO(raw), chunk_size=chunk_size)) == PATHS
+
+
+def test_iter_nul_paths_without_trailing_nul_and_empty_parts():
+    assert list(iter_nul_paths(io.BytesIO(b"a\0\0b"), chunk_size=2)) == ["a", "b"]
+    assert list(iter_nul_paths(io.BytesIO(b""))) == []
+
+
+def test_parse_changed_paths_filters_and_dedups():
+    found = parse_changed_paths(PATHS + ["study/a/2026-10-17/p 1.py\n", "study/a/not-a-date/x.py"])
+    assert found == [
+        ("a", "2026-10-17", "p 1", "study/a/2026-10-17/p 1.py"),
+        ("b", "2026-10-17", "we\nird", "study/b/2026-10-17/we\nird.py"),
+        ("한글", "2026-10-17", "문제", "study/한글/2026-10-17/문제.py"),
+    ]
+
+
+def test_parse_changed_paths_uses_file_stem_of_nested_path():
+    assert parse_changed_paths(["study/a/2026-10-17/sub/dir/q.tar.gz"]) == [
+        ("a", "2026-10-17", "q.tar", "study/a/2026-10-17/sub/dir/q.tar.gz")]
+
+
+def test_git_log_args():
+    assert git_log_args("2026-10-01..2026-10-07") == ["--since=2026-10-01T00:00:00+09:00", "--until=2026-10-07T23:59:59+09:00"]
+    assert git_log_args("..2026-10-07") == ["--until=2026-10-07T23:59:59+09:00"]
+    assert git_log_args("v1..main") == ["v1..main"]
+    with pytest.raises(ValueError):
+        git_log_args("2026-10-01")
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/tests/test_members.py
+from AI_study_automation.scripts.members import MemberDirectory
+
+
+def test_display_name_beats_earlier_members_alias():
+    d = MemberDirectory.from_mapping({"A": {"id": "1", "aliases": ["Bob"]}, "Bob": "2"})
+    assert d.get("Bob").name == "Bob"
+    assert d.discord_id("bob") == "2"
+
+
+def test_folder_beats_earlier_members_alias():
+    d = MemberDirectory.from_mapping({"A": {"id": "1", "aliases": ["b-dir"]}, "B": {"id": "2", "folder": "b-dir"}})
+    assert d.canonical("b-dir") == "B"
+
+
+def test_lookup_by_alias_and_folder_is_normalized():
+    d = MemberDirectory.from_mapping({"성미": {"id": "1", "folder": "sungmi", "aliases": ["유성미"]}, "재성": "2"})
+    assert d.canonical(" SungMi ") == "성미"
+    assert d.canonical("유성미") == "성미"
+    assert d.canonical("모르는사람") == "모르는사람"
+    assert d.discord_ids(["성미", "sungmi", "재성", "x"]) == ["1", "2"]
+    assert d.names == ["성미", "재성"]
+
+
+def test_from_csv():
+    d = MemberDirectory.from_csv(" A, ,B ")
+    assert d.names == ["A", "B"] and "a" in d and len(d) == 2
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/tests/test_ratelimit.py
+import time
+
+from AI_study_automation.scripts.ratelimit import TokenBucket, backoff_delay, parse_retry_after
+
+
+def test_bucket_allows_burst_up_to_capacity():
+    bucket = TokenBucket(rate=1, capacity=3)
+    assert [bucket._take(1) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket._take(1) > 0
+
+
+def test_bucket_wait_matches_rate():
+    bucket = TokenBucket(rate=10, capacity=1)
+    assert bucket._take(1) == 0.0
+    # 토큰 1개가 다시 차기까지 약 0.1초
+    assert 0.05 < bucket._take(1) <= 0.1
+
+
+def test_acquire_blocks_until_refilled():
+    bucket = TokenBucket(rate=50, capacity=1)
+    bucket.acquire()
+    t0 = time.monotonic()
+    waited = bucket.acquire()
+    assert waited > 0
+    assert time.monotonic() - t0 >= 0.01
+
+
+def test_pause_drains_bucket_for_all_callers():
+    bucket = TokenBucket(rate=10, capacity=5)
+    bucket.pause(1.0)
+    # 1초 쉬라는 요청 → 토큰 1개를 얻기까지 1초 이상
+    assert bucket._take(1) >= 1.0
+
+
+def test_parse_retry_after_accepts_fractional_seconds():
+    assert parse_retry_after("1.5") == 1.5
+    assert parse_retry_after(2) == 2.0
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+
+
+def test_backoff_delay_bounds():
+    for attempt in range(8):
+        assert 0 <= backoff_delay(attempt, base=0.5, cap=4.0) <= min(4.0, 0.5 * 2 ** attempt)
+    assert 2.0 <= backoff_delay(0, base=0.5, retry_after=2.0) <= 2.5
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/tests/test_receiver.py
+import threading
+import time
+
+from AI_study_automation.receiver import Debouncer, merge_change
+
+
+def collecting_debouncer(window, max_wait, merge=None):
+    batches, done = [], threading.Event()
+
+    def flush(batch):
+        batches.append(batch)
+        done.set()
+    return Debouncer(flush, window=window, max_wait=max_wait, merge=merge), batches, done
+
+
+def test_burst_is_flushed_once():
+    deb, batches, done = collecting_debouncer(window=0.05, max_wait=5)
+    for i in range(5):
+        deb.add({f"k{i}": i})
+    assert done.wait(2)
+    deb.close()
+    assert batches == [{"k0": 0, "k1": 1, "k2": 2, "k3": 3, "k4": 4}]
+
+
+def test_same_key_is_merged():
+    deb, batches, done = collecting_debouncer(window=0.05, max_wait=5, merge=lambda old, new: old + new)
+    deb.add({"a": 1})
+    deb.add({"a": 2})
+    assert done.wait(2)
+    deb.close()
+    assert batches == [{"a": 3}]
+
+
+def test_max_wait_bounds_a_steady_stream():
+    deb, batches, done = collecting_debouncer(window=0.2, max_wait=0.1)
+    t0 = time.monotonic()
+    while not done.is_set() and time.monotonic() - t0 < 2:
+        deb.add({"x": time.monotonic()})   # window보다 자주 추가해도 max_wait 뒤엔 보냄
+        time.sleep(0.02)
+    deb.close()
+    assert batches and time.monotonic() - t0 < 1
+
+
+def test_close_flushes_pending_items():
+    deb, batches, _ = collecting_debouncer(window=60, max_wait=60)
+    deb.add({"a": 1})
+    deb.close()
+    assert batches == [{"a": 1}]
+
+
+def test_merge_change_keeps_merged_flag_and_pr_url():
+    old = {"merged": True, "pr_url": "https://x/pull/1", "sha": "a"}
+    new = {"merged": False, "pr_url": None, "sha": "b"}
+    assert merge_change(old, new) == {"merged": True, "pr_url": "https://x/pull/1", "sha": "b"}
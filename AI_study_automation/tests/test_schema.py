@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/tests/test_schema.py
+import pytest
+
+from AI_study_automation.scripts.schema import ATTENDANCE, PROBLEMS, SUBMISSIONS, field_name, get_decoder, load_schema
+
+
+def test_load_schema_reads_every_database_in_table_order():
+    schema = load_schema()
+    assert {PROBLEMS, SUBMISSIONS, ATTENDANCE} <= set(schema)
+    assert list(schema[SUBMISSIONS])[:4] == ["Name", "Week", "Submitter", "Problem"]
+    assert schema[PROBLEMS]["Status"] == "select"
+    assert schema[SUBMISSIONS]["Late (min)"] == "number"
+
+
+def test_load_schema_from_custom_file(tmp_path):
+    md = tmp_path / "schema.md"
+    md.write_text(
+        "## 무시할 제목\n| **Orphan** | title |\n"
+        "## 🧪 테스트 DB (Test DB)\n| 필드명 | 타입 | 설명 |\n|:--|:--|:--|\n"
+        "| **Name** | title | 이름 |\n| **Done?** | checkbox | 완료 |\n",
+        encoding="utf-8",
+    )
+    assert load_schema(str(md)) == {"Test DB": {"Name": "title", "Done?": "checkbox"}}
+
+
+def test_field_name():
+    assert field_name("File Path") == "file_path"
+    assert field_name("Late (min)") == "late_min"
+    assert field_name("On-time") == "on_time"
+
+
+def test_decoder_extracts_typed_values():
+    decode = get_decoder(SUBMISSIONS, ["Submitter", "Commit Time", "On-time", "Late (min)", "PR URL"])
+    page = {
+        "id": "p1", "last_edited_time": "2026-10-17T00:00:00.000Z",
+        "properties": {
+            "Submitter": {"rich_text": [{"plain_text": "성"}, {"plain_text": "미"}]},
+            "Commit Time": {"date": {"start": "2026-10-17T21:00:00+09:00"}},
+            "On-time": {"checkbox": True},
+            "Late (min)": {"number": 0},
+        },
+    }
+    rec = decode(page)
+    assert rec == ("p1", "2026-10-17T00:00:00.000Z", "성미", "2026-10-17T21:00:00+09:00", True, 0, None)
+    assert rec.submitter == "성미" and rec.pr_url is None
+
+
+def test_get_decoder_rejects_unknown_property():
+    with pytest.raises(KeyError):
+        get_decoder(SUBMISSIONS, ["Nope"])
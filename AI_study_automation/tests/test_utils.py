@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+# AI_study_automation/tests/test_utils.py
+from AI_study_automation.scripts.utils import split_content
+
+
+def test_split_content_keeps_every_line():
+    lines = ["🗓️ 2026-09-01 ~ 2026-10-17 출석 재계산"]
+    lines += [f"2026-09-{d:02d} ✅ 3/10 · 결석: " + ", ".join(f"member{i:02d}" for i in range(7)) for d in range(1, 31)]
+    chunks = list(split_content(lines, limit=500))
+    assert len(chunks) > 1
+    assert all(len(c) <= 500 for c in chunks)
+    assert "\n".join(chunks).split("\n") == lines
+
+
+def test_split_content_short_and_overlong_lines():
+    assert list(split_content(["a", "b"])) == ["a\nb"]
+    assert list(split_content(["x" * 30, "y"], limit=10)) == ["x" * 30, "y"]
+    assert list(split_content([])) == []